@@ -4,42 +4,224 @@ Console UI loop for Hackathon 2 — Phase 1.
 Rules:
 - This file handles input/output only.
 - All business logic lives in skills/.
-- In-memory only (no files, no DB).
+- In-memory by default; --data-dir enables the optional journal
+  (write-ahead log + snapshots, see journal.py).
+
+Modes:
+- Interactive (default): prompt + one command per line
+- Script: --script FILE (or "-" for stdin) runs commands without
+  prompts/help and writes all output in a single write at the end
 """
 
+import argparse
+import sys
+import time
+from typing import Callable, Iterable, List, Optional
+
+from journal import Journal
+from store import store
 from skills.add_task import add_task
 from skills.list_tasks import list_tasks
 from skills.update_task import update_task
 from skills.delete_task import delete_task
 from skills.toggle_task import toggle_task
+from skills.search_tasks import search_tasks
 
 
-def print_help() -> None:
-    print(
-        """
+# search prints at most SEARCH_LIMIT matches and counts the rest only up to
+# SEARCH_COUNT_CAP, so a common word never walks the whole store.
+SEARCH_LIMIT = 20
+SEARCH_COUNT_CAP = 1000
+
+
+HELP_TEXT = """
 Commands:
   add <title>                 Add a new task
   list [all|active|completed] List tasks
+  search <text>               Find tasks by title
   update <id> <new title>     Update task title
   toggle <id>                 Toggle complete
   delete <id>                 Delete task
   help                        Show this help
   exit                        Exit the app
 """
-    )
 
 
-def print_tasks(items) -> None:
+def print_help() -> None:
+    print(HELP_TEXT)
+
+
+def format_tasks(items) -> List[str]:
     if not items:
-        print("No tasks.")
-        return
+        return ["No tasks."]
 
+    lines = []
     for idx, t in enumerate(items, start=1):
         status = "[x]" if bool(t.get("is_completed")) else "[ ]"
-        print(f"{idx}. {status} {t.get('id')} — {t.get('title')}")
+        lines.append(f"{idx}. {status} {t.get('id')} — {t.get('title')}")
+    return lines
+
+
+def run_command(raw: str, out: Callable[[str], None]) -> bool:
+    """
+    Execute one command line, sending output lines to `out`.
+
+    Returns:
+        False if the command was "exit", else True.
+    """
+    parts = raw.split(" ", 1)
+    cmd = parts[0].lower()
+    arg = parts[1] if len(parts) > 1 else ""
+
+    if cmd == "exit":
+        out("Goodbye.")
+        return False
+
+    if cmd == "help":
+        out(HELP_TEXT)
+        return True
+
+    if cmd == "add":
+        if not arg.strip():
+            out("Usage: add <title>")
+            return True
+        ok, msg, _ = add_task(arg)
+        out(msg)
+        return True
+
+    if cmd == "list":
+        mode = arg.strip() if arg.strip() else "all"
+        ok, msg, items = list_tasks(mode)
+        if not ok:
+            out(msg)
+        else:
+            for line in format_tasks(items):
+                out(line)
+        return True
+
+    if cmd == "search":
+        if not arg.strip():
+            out("Usage: search <text>")
+            return True
+        ok, msg, items = search_tasks(arg, SEARCH_LIMIT + SEARCH_COUNT_CAP + 1)
+        if not ok:
+            out(msg)
+        else:
+            for line in format_tasks(items[:SEARCH_LIMIT]):
+                out(line)
+            more = len(items) - SEARCH_LIMIT
+            if more > SEARCH_COUNT_CAP:
+                out(f"... and more than {SEARCH_COUNT_CAP} more matches (refine your search).")
+            elif more > 0:
+                out(f"... and {more} more matches.")
+        return True
+
+    if cmd == "update":
+        if not arg.strip() or " " not in arg:
+            out("Usage: update <id> <new title>")
+            return True
+        tid, new_title = arg.split(" ", 1)
+        ok, msg, _ = update_task(tid, new_title)
+        out(msg)
+        return True
+
+    if cmd == "toggle":
+        if not arg.strip():
+            out("Usage: toggle <id>")
+            return True
+        ok, msg, _ = toggle_task(arg)
+        out(msg)
+        return True
+
+    if cmd == "delete":
+        if not arg.strip():
+            out("Usage: delete <id>")
+            return True
+        ok, msg = delete_task(arg)
+        out(msg)
+        return True
+
+    out("Unknown command. Type 'help' to see commands.")
+    return True
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hackathon 2 | Phase 1 — In-Memory Todo")
+    parser.add_argument(
+        "--data-dir",
+        default=None,
+        help="persist tasks in this directory (write-ahead log + snapshots)",
+    )
+    parser.add_argument(
+        "--script",
+        default=None,
+        metavar="FILE",
+        help="run commands from FILE ('-' for stdin) without prompts",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="with --script: report command count and throughput on stderr",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    journal: Optional[Journal] = None
+    if args.data_dir:
+        journal = Journal(args.data_dir)
+        loaded = journal.open(store)
+        if args.script is None:
+            print(f"Loaded {loaded} task(s) from {args.data_dir}")
+
+    try:
+        if args.script is None:
+            run_interactive()
+        elif args.script == "-":
+            run_script(sys.stdin, timing=args.timing)
+        else:
+            with open(args.script, encoding="utf-8") as f:
+                run_script(f, timing=args.timing)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def run_script(lines: Iterable[str], timing: bool = False) -> int:
+    """
+    Stream commands from `lines` and write all output once at the end.
+
+    Returns:
+        number of commands executed
+    """
+    output: List[str] = []
+    out = output.append
+    count = 0
+
+    start = time.perf_counter()
+    for line in lines:
+        raw = line.strip()
+        if not raw or raw.startswith("#"):
+            continue
+        count += 1
+        if not run_command(raw, out):
+            break
+    elapsed = time.perf_counter() - start
+
+    if output:
+        sys.stdout.write("\n".join(output) + "\n")
+        sys.stdout.flush()
+
+    if timing:
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        sys.stderr.write(f"{count} command(s) in {elapsed:.3f}s ({rate:,.0f} cmd/s)\n")
 
+    return count
 
-def main() -> None:
+
+def run_interactive() -> None:
     print("=== Hackathon 2 | Phase 1 — In-Memory Todo ===")
     print_help()
 
@@ -53,62 +235,9 @@ def main() -> None:
         if not raw:
             continue
 
-        parts = raw.split(" ", 1)
-        cmd = parts[0].lower()
-        arg = parts[1] if len(parts) > 1 else ""
-
-        if cmd == "exit":
-            print("Goodbye.")
+        if not run_command(raw, print):
             break
 
-        if cmd == "help":
-            print_help()
-            continue
-
-        if cmd == "add":
-            if not arg.strip():
-                print("Usage: add <title>")
-                continue
-            ok, msg, _ = add_task(arg)
-            print(msg)
-            continue
-
-        if cmd == "list":
-            mode = arg.strip() if arg.strip() else "all"
-            ok, msg, items = list_tasks(mode)
-            if not ok:
-                print(msg)
-            else:
-                print_tasks(items)
-            continue
-
-        if cmd == "update":
-            if not arg.strip() or " " not in arg:
-                print("Usage: update <id> <new title>")
-                continue
-            tid, new_title = arg.split(" ", 1)
-            ok, msg, _ = update_task(tid, new_title)
-            print(msg)
-            continue
-
-        if cmd == "toggle":
-            if not arg.strip():
-                print("Usage: toggle <id>")
-                continue
-            ok, msg, _ = toggle_task(arg)
-            print(msg)
-            continue
-
-        if cmd == "delete":
-            if not arg.strip():
-                print("Usage: delete <id>")
-                continue
-            ok, msg = delete_task(arg)
-            print(msg)
-            continue
-
-        print("Unknown command. Type 'help' to see commands.")
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: journal write throughput and restart time
+
+Purpose:
+- Measure mutations/sec through the skills with the journal attached
+  (for a few fsync batch sizes)
+- Measure restart time from a WAL only vs from a snapshot
+
+Run:
+    python phase1-console/benchmarks/bench_journal.py [--n 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import Journal  # noqa: E402
+from store import TaskStore, store  # noqa: E402
+from skills.add_task import add_task  # noqa: E402
+from skills.toggle_task import toggle_task  # noqa: E402
+
+
+def _write_workload(data_dir: str, n: int, fsync_every: int, snapshot_every: int) -> float:
+    """
+    Run n adds + n toggles with the journal attached.
+    Returns mutations per second. Leaves the WAL on disk (no compaction).
+    """
+    journal = Journal(data_dir, fsync_every=fsync_every, snapshot_every=snapshot_every)
+    journal.open(store)
+
+    start = time.perf_counter()
+    ids = [add_task(f"Task number {i}")[2]["id"] for i in range(n)]
+    for tid in ids:
+        toggle_task(tid)
+    journal.sync()
+    elapsed = time.perf_counter() - start
+
+    # Keep the WAL for the restart test
+    journal.close(compact=False)
+    return (2 * n) / elapsed
+
+
+def _restart(data_dir: str) -> float:
+    """
+    Return seconds needed to rebuild a store from data_dir.
+    """
+    fresh = TaskStore()
+    journal = Journal(data_dir)
+    start = time.perf_counter()
+    journal.open(fresh)
+    elapsed = time.perf_counter() - start
+    journal.close(compact=False)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Journal benchmark")
+    parser.add_argument("--n", type=int, default=100_000, help="tasks to add (each is also toggled)")
+    args = parser.parse_args()
+    n = args.n
+
+    root = tempfile.mkdtemp(prefix="nimbus-journal-")
+    try:
+        print(f"tasks: {n:,} (mutations: {2 * n:,})")
+        print("write throughput (WAL only, no snapshots):")
+        for fsync_every in (1, 64, 1024):
+            data_dir = os.path.join(root, f"fsync-{fsync_every}")
+            # fsync per record is slow; cap its workload
+            count = min(n, 5_000) if fsync_every == 1 else n
+            ops = _write_workload(data_dir, count, fsync_every, snapshot_every=10**12)
+            print(f"  fsync every {fsync_every:>5}: {ops:12,.0f} mutations/sec  (n={count:,})")
+
+        wal_dir = os.path.join(root, "fsync-64")
+        print("restart time:")
+        print(f"  WAL replay ({2 * n:,} records): {_restart(wal_dir) * 1000:10.1f} ms")
+
+        # Compact into a snapshot, then restart again
+        compact = Journal(wal_dir)
+        compact.open(TaskStore())
+        compact.snapshot()
+        compact.close()
+        print(f"  snapshot load ({n:,} tasks):  {_restart(wal_dir) * 1000:10.1f} ms")
+    finally:
+        store.clear()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: task memory layout
+
+Purpose:
+- Compare memory used by the old dict-per-task layout
+  (five keys, two ISO timestamp strings) with the slotted Task
+  record (epoch-int timestamps) used by store.py
+
+Run:
+    python phase1-console/benchmarks/bench_memory.py [--n 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store import Task, generate_id, now_iso, now_us  # noqa: E402
+
+
+def _build_dicts(n: int) -> List[object]:
+    """
+    Old layout: one dict per task, timestamps as ISO strings.
+    """
+    return [
+        {
+            "id": generate_id(),
+            "title": f"Task number {i}",
+            "is_completed": False,
+            "created_at": now_iso(),
+            "updated_at": now_iso(),
+        }
+        for i in range(n)
+    ]
+
+
+def _build_slotted(n: int) -> List[object]:
+    """
+    New layout: slotted Task, timestamps as epoch microseconds.
+    """
+    out: List[object] = []
+    for i in range(n):
+        ts = now_us()
+        out.append(Task(generate_id(), f"Task number {i}", False, ts, ts))
+    return out
+
+
+def _measure(build: Callable[[int], List[object]], n: int) -> int:
+    """
+    Return bytes still allocated after building n tasks.
+    """
+    gc.collect()
+    tracemalloc.start()
+    items = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    gc.collect()
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Task memory layout benchmark")
+    parser.add_argument("--n", type=int, default=100_000, help="number of tasks")
+    args = parser.parse_args()
+
+    n = args.n
+    dict_bytes = _measure(_build_dicts, n)
+    slot_bytes = _measure(_build_slotted, n)
+
+    print(f"tasks:          {n:,}")
+    print(f"dict layout:    {dict_bytes / 1e6:10.1f} MB  ({dict_bytes / n:6.0f} B/task)")
+    print(f"slotted layout: {slot_bytes / 1e6:10.1f} MB  ({slot_bytes / n:6.0f} B/task)")
+    print(f"saved:          {(1 - slot_bytes / dict_bytes) * 100:10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
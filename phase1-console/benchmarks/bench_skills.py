@@ -0,0 +1,188 @@
+"""
+Benchmark: phase-1 skills layer
+
+Purpose:
+- Seed stores of increasing size and time each skill against them
+- Report ops/sec per skill and peak memory of the seeded store
+- Save results as JSON and compare against a saved baseline, so
+  regressions show up between commits
+
+Run:
+    python phase1-console/benchmarks/bench_skills.py
+    python phase1-console/benchmarks/bench_skills.py --sizes 1000,100000 --save baseline.json
+    python phase1-console/benchmarks/bench_skills.py --compare baseline.json
+
+Exit code is 1 if --compare finds a skill slower than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store import Task, find_task, now_us, store  # noqa: E402
+from skills.add_task import add_task  # noqa: E402
+from skills.delete_task import delete_task  # noqa: E402
+from skills.list_tasks import count_tasks, list_tasks  # noqa: E402
+from skills.search_tasks import search_tasks  # noqa: E402
+from skills.toggle_task import toggle_task  # noqa: E402
+from skills.update_task import update_task  # noqa: E402
+
+
+DEFAULT_SIZES = "1000,100000,1000000"
+DEFAULT_THRESHOLD = 0.20  # 20% slower than baseline = regression
+
+_WORDS = ["buy", "milk", "read", "book", "call", "mom", "fix", "bike",
+          "pay", "rent", "email", "boss", "plan", "trip", "gym", "code"]
+
+
+def _seed(size: int, rng: random.Random) -> List[str]:
+    """
+    Fill the store with `size` tasks (~1/3 completed). Returns their ids.
+    """
+    store.clear()
+    ids: List[str] = []
+    for i in range(size):
+        ts = now_us()
+        tid = f"{i:032x}"
+        title = f"{' '.join(rng.sample(_WORDS, 3))} {i}"
+        store.add(Task(tid, title, i % 3 == 0, ts, ts))
+        ids.append(tid)
+    return ids
+
+
+def _time_ops(fn: Callable[[int], Any], ops: int) -> float:
+    """
+    Call fn(i) for i in range(ops). Returns ops/sec.
+    """
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return ops / elapsed if elapsed > 0 else float("inf")
+
+
+def bench_size(size: int, ops: int, measure_memory: bool) -> Dict[str, float]:
+    """
+    Seed a store of `size` tasks and time each skill against it.
+    """
+    rng = random.Random(size)
+
+    if measure_memory:
+        tracemalloc.start()
+    ids = _seed(size, rng)
+    peak_mb = 0.0
+    if measure_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 1e6
+
+    point_ops = min(ops, size)
+    picks = [rng.choice(ids) for _ in range(point_ops)]
+    victims = rng.sample(ids, point_ops)
+    queries = [f"{rng.randrange(size)}" for _ in range(point_ops)]
+    full_list_ops = max(1, min(20, 100_000 // size))
+
+    results: Dict[str, float] = {
+        "find_task": _time_ops(lambda i: find_task(picks[i]), point_ops),
+        "list_tasks_page": _time_ops(lambda i: list_tasks("active", 0, 50), point_ops),
+        "list_tasks_all": _time_ops(lambda i: list_tasks("all"), full_list_ops),
+        "count_tasks": _time_ops(lambda i: count_tasks("completed"), point_ops),
+        "toggle_task": _time_ops(lambda i: toggle_task(picks[i]), point_ops),
+        "update_task": _time_ops(lambda i: update_task(picks[i], f"renamed {i}"), point_ops),
+        "search_tasks": _time_ops(lambda i: search_tasks(queries[i], 50), point_ops),
+        "add_task": _time_ops(lambda i: add_task(f"new task {i}"), point_ops),
+        "delete_task": _time_ops(lambda i: delete_task(victims[i]), point_ops),
+    }
+    results["peak_mb"] = peak_mb
+
+    store.clear()
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Return one line per skill whose ops/sec dropped more than `threshold`.
+    """
+    regressions: List[str] = []
+    for size, skills in current["results"].items():
+        base_skills = baseline.get("results", {}).get(size)
+        if not base_skills:
+            continue
+        for name, value in skills.items():
+            base = base_skills.get(name)
+            if name == "peak_mb" or not base:
+                continue
+            change = value / base - 1
+            if change < -threshold:
+                regressions.append(
+                    f"  size={size:>9} {name:<16} {base:14,.0f} -> {value:14,.0f} ops/s ({change:+.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Phase-1 skills benchmark")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated store sizes")
+    parser.add_argument("--ops", type=int, default=1000, help="operations per point benchmark")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster seeding)")
+    parser.add_argument("--save", metavar="PATH", help="write results JSON to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="compare against baseline JSON at PATH")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "ops": args.ops,
+        },
+        "results": {},
+    }
+
+    for size in sizes:
+        results = bench_size(size, args.ops, not args.no_memory)
+        report["results"][str(size)] = results
+
+        print(f"\nstore size: {size:,}")
+        for name, value in results.items():
+            if name == "peak_mb":
+                if not args.no_memory:
+                    print(f"  {'peak memory':<16} {value:14.1f} MB")
+                continue
+            print(f"  {name:<16} {value:14,.0f} ops/s")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nsaved: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nREGRESSIONS (> {args.threshold:.0%} slower than {args.compare}):")
+            print("\n".join(regressions))
+            return 1
+        print(f"\nno regressions vs {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Durable journal for the task store (optional).
+
+Purpose:
+- Append every store mutation to a write-ahead log (WAL)
+- Periodically write a compact snapshot and truncate the WAL
+- Rebuild the store on startup: memory-mapped snapshot + WAL replay
+
+Rules:
+- No input(), no print()
+- Opt-in only: app.py uses it when started with --data-dir
+- Store stays I/O free; it reports mutations via TaskStore.journal
+
+Files (inside data_dir), one compact JSON array per line:
+- tasks.snapshot: [id, title, is_completed, created_at_us, updated_at_us]
+- tasks.wal:      ["a", id, title, is_completed, created_at_us, updated_at_us]
+                  ["u", id, title, is_completed, created_at_us, updated_at_us]
+                  ["d", id]
+                  ["x"]  (store cleared)
+
+Records carry absolute values, so replaying a WAL on top of a snapshot
+that already contains it (crash between snapshot and WAL truncate)
+still ends in the same state.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from typing import Any, List, Optional, Tuple
+
+from store import Task, TaskStore
+
+
+WAL_FILE = "tasks.wal"
+SNAPSHOT_FILE = "tasks.snapshot"
+
+# fsync the WAL once per this many records (batched durability)
+DEFAULT_FSYNC_EVERY = 64
+
+# write a snapshot + truncate the WAL once per this many records
+DEFAULT_SNAPSHOT_EVERY = 10_000
+
+
+def _encode(record: List[Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _task_fields(task: Task) -> List[Any]:
+    return [
+        task.id,
+        task.title,
+        1 if task.is_completed else 0,
+        task.created_at_us,
+        task.updated_at_us,
+    ]
+
+
+def _fsync_dir(path: str) -> None:
+    """
+    Persist a rename inside a directory (POSIX only; no-op elsewhere).
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Write-ahead log + snapshot persistence for a TaskStore.
+
+    Notes:
+    - Records are buffered and fsync'd every `fsync_every` records,
+      so a crash can lose at most that many recent mutations.
+    - Call close() on shutdown: it syncs and compacts into a snapshot.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+    ) -> None:
+        if fsync_every < 1 or snapshot_every < 1:
+            raise ValueError("fsync_every and snapshot_every must be >= 1")
+
+        self.data_dir = data_dir
+        self.wal_path = os.path.join(data_dir, WAL_FILE)
+        self.snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+        self.fsync_every = fsync_every
+        self.snapshot_every = snapshot_every
+
+        self._store: Optional[TaskStore] = None
+        self._wal: Optional[Any] = None
+        self._unsynced = 0
+        self._since_snapshot = 0
+
+    # ---------- lifecycle ----------
+
+    def open(self, store: TaskStore) -> int:
+        """
+        Load snapshot + WAL into `store` (replacing its contents),
+        then attach so later mutations are journaled.
+
+        Returns:
+            number of tasks loaded
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        store.journal = None
+        store.clear()
+
+        self._load_snapshot(store)
+        valid_end, replayed = self._replay_wal(store)
+
+        # Drop a torn trailing record (crash mid-write) before appending
+        self._wal = open(self.wal_path, "ab")
+        self._wal.truncate(valid_end)
+
+        self._unsynced = 0
+        self._since_snapshot = replayed
+        self._store = store
+        store.journal = self
+        return len(store)
+
+    def sync(self) -> None:
+        """
+        Flush buffered records and fsync the WAL.
+        """
+        if self._wal is None:
+            return
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._unsynced = 0
+
+    def snapshot(self) -> None:
+        """
+        Write the whole store to a new snapshot, then truncate the WAL.
+        """
+        if self._store is None or self._wal is None:
+            return
+
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.writelines(_encode(_task_fields(task)) for task in self._store)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.data_dir)
+
+        self._wal.flush()
+        self._wal.truncate(0)
+        os.fsync(self._wal.fileno())
+        self._unsynced = 0
+        self._since_snapshot = 0
+
+    def close(self, compact: bool = True) -> None:
+        """
+        Compact (if anything changed), sync and detach from the store.
+        With compact=False the WAL is only synced, not folded into a snapshot.
+        """
+        if self._wal is None:
+            return
+
+        if compact and self._since_snapshot:
+            self.snapshot()
+        else:
+            self.sync()
+
+        self._wal.close()
+        self._wal = None
+
+        if self._store is not None:
+            self._store.journal = None
+            self._store = None
+
+    # ---------- store listener ----------
+
+    def task_added(self, task: Task) -> None:
+        self._append(["a", *_task_fields(task)])
+
+    def task_updated(self, task: Task) -> None:
+        self._append(["u", *_task_fields(task)])
+
+    def task_removed(self, task_id: str) -> None:
+        self._append(["d", task_id])
+
+    def store_cleared(self) -> None:
+        self._append(["x"])
+
+    # ---------- internals ----------
+
+    def _append(self, record: List[Any]) -> None:
+        if self._wal is None:
+            return
+
+        self._wal.write(_encode(record))
+        self._unsynced += 1
+        self._since_snapshot += 1
+
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        elif self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def _load_snapshot(self, store: TaskStore) -> None:
+        """
+        Read the snapshot through mmap (no per-line read() syscalls).
+        """
+        try:
+            f = open(self.snapshot_path, "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # mmap cannot map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                add = store.add
+                for line in iter(mm.readline, b""):
+                    tid, title, done, created_us, updated_us = json.loads(line)
+                    add(Task(tid, title, bool(done), created_us, updated_us))
+
+    def _replay_wal(self, store: TaskStore) -> Tuple[int, int]:
+        """
+        Apply WAL records in order.
+
+        Returns:
+            (byte offset after the last valid record, records applied)
+        """
+        try:
+            f = open(self.wal_path, "rb")
+        except FileNotFoundError:
+            return 0, 0
+
+        offset = 0
+        applied = 0
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0, 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    _apply(store, record)
+                    offset += len(line)
+                    applied += 1
+
+        return offset, applied
+
+
+def _apply(store: TaskStore, record: List[Any]) -> None:
+    """
+    Apply one WAL record to a store (store.journal must be None).
+    """
+    op = record[0]
+
+    if op == "a":
+        _, tid, title, done, created_us, updated_us = record
+        store.add(Task(tid, title, bool(done), created_us, updated_us))
+
+    elif op == "u":
+        _, tid, title, done, created_us, updated_us = record
+        if store.get(tid) is None:
+            store.add(Task(tid, title, bool(done), created_us, updated_us))
+        else:
+            store.set_completed(tid, bool(done), updated_us)
+            store.set_title(tid, title, updated_us)
+
+    elif op == "d":
+        store.remove(record[1])
+
+    elif op == "x":
+        store.clear()
@@ -0,0 +1,119 @@
+"""
+Trigram index over task titles.
+
+Purpose:
+- Find tasks whose normalized title contains a search string
+  without scanning every task
+
+Rules:
+- No input(), no print()
+- No file I/O, no database
+- Maintained incrementally by TaskStore (add / set_title / remove)
+
+How it works:
+- Titles are normalized (casefold + collapsed whitespace).
+- Each distinct 3-character substring ("trigram") maps to the set of
+  task ids whose title contains it.
+- A query of 3+ characters looks up the postings of its trigrams
+  (smallest first); the caller keeps ids present in all of them and
+  verifies the real substring match (trigrams need not be contiguous).
+- Queries shorter than 3 characters have no trigrams; callers handle
+  them with a bounded scan instead.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set
+
+
+def normalize_title(text: str) -> str:
+    """
+    Normalize text for searching: casefold + single spaces, trimmed.
+    """
+    return " ".join((text or "").casefold().split())
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """
+    Return the distinct trigrams of an already-normalized string.
+    """
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+class TrigramIndex:
+    """
+    Incremental trigram -> task id postings.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[str]] = {}
+
+    def add(self, task_id: str, title: str) -> None:
+        postings = self._postings
+        for gram in trigrams(normalize_title(title)):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {task_id}
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id: str, title: str) -> None:
+        postings = self._postings
+        for gram in trigrams(normalize_title(title)):
+            ids = postings.get(gram)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del postings[gram]
+
+    def replace(self, task_id: str, old_title: str, new_title: str) -> None:
+        """
+        Re-index a renamed task, touching only trigrams that changed.
+        """
+        old = trigrams(normalize_title(old_title))
+        new = trigrams(normalize_title(new_title))
+        postings = self._postings
+
+        for gram in old - new:
+            ids = postings.get(gram)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del postings[gram]
+
+        for gram in new - old:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {task_id}
+            else:
+                ids.add(task_id)
+
+    def postings(self, normalized_query: str) -> Optional[List[Set[str]]]:
+        """
+        Return the posting sets of every trigram of the query, smallest first.
+
+        Notes:
+        - Returns None if the query is shorter than 3 characters
+          (the index cannot answer it).
+        - Returns [] if some trigram has no postings (nothing can match).
+        - The sets are the live index; do not mutate them.
+        """
+        grams = trigrams(normalized_query)
+        if not grams:
+            return None
+
+        postings = self._postings
+        lists = []
+        for gram in grams:
+            ids = postings.get(gram)
+            if not ids:
+                return []
+            lists.append(ids)
+
+        lists.sort(key=len)
+        return lists
+
+    def clear(self) -> None:
+        self._postings.clear()
@@ -5,6 +5,7 @@ Purpose:
 - Validate task title
 - Create a new task entity
 - Append it to the in-memory store
+- Bulk variant: add_tasks
 
 Rules:
 - Pure logic only
@@ -12,8 +13,8 @@ Rules:
 - In-memory behavior only (Phase-1)
 """
 
-from typing import Dict, Tuple, Any
-from store import tasks, generate_id, now_iso
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+from store import Task, store, generate_id, now_us
 
 
 
@@ -24,6 +25,21 @@ def _normalize_title(title: str) -> str:
     return (title or "").strip()
 
 
+def _validate_title(title: str) -> Tuple[Optional[str], str]:
+    """
+    Return (clean_title, "") if valid, else (None, error message).
+    """
+    clean = _normalize_title(title)
+
+    if not clean:
+        return None, "Title is required."
+
+    if len(clean) > 80:
+        return None, "Title too long (max 80)."
+
+    return clean, ""
+
+
 def add_task(title: str) -> Tuple[bool, str, Dict[str, Any]]:
     """
     Add a new task to the in-memory store.
@@ -35,21 +51,54 @@ def add_task(title: str) -> Tuple[bool, str, Dict[str, Any]]:
     - If ok is False, task will be an empty dict.
     - Title must be non-empty and <= 80 characters.
     """
-    clean = _normalize_title(title)
+    clean, error = _validate_title(title)
 
-    if not clean:
-        return False, "Title is required.", {}
+    if clean is None:
+        return False, error, {}
 
-    if len(clean) > 80:
-        return False, "Title too long (max 80).", {}
-
-    task: Dict[str, Any] = {
-        "id": generate_id(),
-        "title": clean,
-        "is_completed": False,
-        "created_at": now_iso(),
-        "updated_at": now_iso(),
-    }
-
-    tasks.append(task)
-    return True, "Task added.", task
+    # One clock read for both timestamps; stored as epoch ints
+    ts = now_us()
+    task = Task(
+        id=generate_id(),
+        title=clean,
+        is_completed=False,
+        created_at_us=ts,
+        updated_at_us=ts,
+    )
+
+    store.add(task)
+    return True, "Task added.", task.to_dict()
+
+
+def add_tasks(titles: Iterable[str]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+    """
+    Add many tasks in one call.
+
+    Returns:
+        one (ok, message, task) per input title, in input order
+
+    Notes:
+    - The whole batch is validated first, then valid titles are added
+      in a single pass (one clock read for the batch).
+    - Invalid titles do not block valid ones; their item is {}.
+    """
+    checked = [_validate_title(title) for title in titles]
+
+    ts = now_us()
+    results: List[Tuple[bool, str, Dict[str, Any]]] = []
+    for clean, error in checked:
+        if clean is None:
+            results.append((False, error, {}))
+            continue
+
+        task = Task(
+            id=generate_id(),
+            title=clean,
+            is_completed=False,
+            created_at_us=ts,
+            updated_at_us=ts,
+        )
+        store.add(task)
+        results.append((True, "Task added.", task.to_dict()))
+
+    return results
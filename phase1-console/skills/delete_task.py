@@ -3,6 +3,7 @@ Skill: delete_task
 
 Purpose:
 - Remove a task by id from the in-memory store
+- Bulk variant: delete_tasks
 
 Rules:
 - Pure logic only
@@ -10,8 +11,8 @@ Rules:
 - In-memory behavior only (Phase-1)
 """
 
-from typing import Tuple
-from store import tasks, find_task
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from store import store
 
 
 def delete_task(task_id: str) -> Tuple[bool, str]:
@@ -30,10 +31,50 @@ def delete_task(task_id: str) -> Tuple[bool, str]:
     if not tid:
         return False, "Task id is required."
 
-    task = find_task(tid)
+    # Single dict pop: O(1) lookup + removal
+    task = store.remove(tid)
     if not task:
         return False, "Task not found."
 
-    # Remove by identity (safe because task originates from the same list)
-    tasks.remove(task)
     return True, "Task deleted."
+
+
+def delete_tasks(task_ids: Iterable[str]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+    """
+    Delete many tasks in one call.
+
+    Returns:
+        one (ok, message, task) per input id, in input order;
+        task is the deleted task (or {} on failure)
+
+    Notes:
+    - The whole batch is validated first (id present, exists, not
+      repeated in the batch), then valid ids are removed in one pass.
+    - Each removal is an O(1) dict pop, so a batch of k ids costs O(k)
+      regardless of store size.
+    - Invalid ids do not block valid ones.
+    """
+    checked: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for task_id in task_ids:
+        tid = (task_id or "").strip()
+        if not tid:
+            checked.append((tid, "Task id is required."))
+        elif tid in seen:
+            checked.append((tid, "Duplicate task id in batch."))
+        elif tid not in store:
+            checked.append((tid, "Task not found."))
+        else:
+            checked.append((tid, ""))
+        seen.add(tid)
+
+    results: List[Tuple[bool, str, Dict[str, Any]]] = []
+    for tid, error in checked:
+        if error:
+            results.append((False, error, {}))
+            continue
+
+        task = store.remove(tid)
+        results.append((True, "Task deleted.", task.to_dict()))
+
+    return results
@@ -3,6 +3,7 @@ Skill: list_tasks
 
 Purpose:
 - Return tasks from the in-memory store (optionally filtered)
+- Page through tasks lazily and count them per status
 
 Rules:
 - Pure logic only
@@ -10,16 +11,40 @@ Rules:
 - In-memory behavior only (Phase-1)
 """
 
-from typing import Dict, List, Tuple, Any
-from store import tasks
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+from store import store
 
 
-def list_tasks(filter_by: str = "all") -> Tuple[bool, str, List[Dict[str, Any]]]:
+# filter name -> is_completed argument for the store's status indexes
+_FILTERS: Dict[str, Optional[bool]] = {
+    "all": None,
+    "active": False,
+    "completed": True,
+}
+
+
+def _resolve_filter(filter_by: str) -> Tuple[bool, Optional[bool]]:
+    """
+    Map a filter name to (valid, is_completed).
+    """
+    mode = (filter_by or "all").strip().lower()
+    if mode not in _FILTERS:
+        return False, None
+    return True, _FILTERS[mode]
+
+
+def list_tasks(
+    filter_by: str = "all",
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
     """
     List tasks from the in-memory store.
 
     Args:
         filter_by: "all" | "active" | "completed"
+        offset: number of matching tasks to skip
+        limit: max tasks to return (None = no limit)
 
     Returns:
         (ok, message, items)
@@ -27,19 +52,48 @@ def list_tasks(filter_by: str = "all") -> Tuple[bool, str, List[Dict[str, Any]]]
     Notes:
     - If filter_by is invalid, ok is False and items is [].
     - Returned list is a shallow copy (safe for display).
+    - Cost is O(offset + page size), not O(total tasks).
     """
-    mode = (filter_by or "all").strip().lower()
+    valid, is_completed = _resolve_filter(filter_by)
 
-    if mode not in ("all", "active", "completed"):
+    if not valid:
         return False, "Invalid filter. Use: all | active | completed.", []
 
-    if mode == "all":
-        return True, "OK", list(tasks)
+    if offset < 0 or (limit is not None and limit < 0):
+        return False, "Offset and limit must be >= 0.", []
+
+    return True, "OK", [t.to_dict() for t in store.page(is_completed, offset, limit)]
+
+
+def iter_tasks(filter_by: str = "all") -> Tuple[bool, str, Iterator[Dict[str, Any]]]:
+    """
+    Lazily iterate tasks from the in-memory store.
+
+    Returns:
+        (ok, message, iterator)
+
+    Notes:
+    - If filter_by is invalid, ok is False and the iterator is empty.
+    - Do not add/toggle/delete tasks while consuming the iterator.
+    """
+    valid, is_completed = _resolve_filter(filter_by)
+
+    if not valid:
+        return False, "Invalid filter. Use: all | active | completed.", iter(())
+
+    return True, "OK", (t.to_dict() for t in store.iter_status(is_completed))
+
+
+def count_tasks(filter_by: str = "all") -> Tuple[bool, str, int]:
+    """
+    Count tasks in the in-memory store. O(1).
+
+    Returns:
+        (ok, message, count)
+    """
+    valid, is_completed = _resolve_filter(filter_by)
 
-    if mode == "active":
-        items = [t for t in tasks if not bool(t.get("is_completed"))]
-        return True, "OK", items
+    if not valid:
+        return False, "Invalid filter. Use: all | active | completed.", 0
 
-    # mode == "completed"
-    items = [t for t in tasks if bool(t.get("is_completed"))]
-    return True, "OK", items
+    return True, "OK", store.count(is_completed)
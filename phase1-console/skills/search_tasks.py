@@ -0,0 +1,41 @@
+"""
+Skill: search_tasks
+
+Purpose:
+- Find tasks whose title contains the given text
+  (case-insensitive, backed by the store's trigram index)
+
+Rules:
+- Pure logic only
+- No input(), no print()
+- In-memory behavior only (Phase-1)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from store import store
+
+
+def search_tasks(
+    text: str,
+    limit: Optional[int] = None,
+) -> Tuple[bool, str, List[Dict[str, Any]]]:
+    """
+    Search tasks by title substring.
+
+    Returns:
+        (ok, message, items)
+
+    Notes:
+    - If ok is False, items is [].
+    - text must be non-empty after trimming.
+    - limit caps the number of returned tasks (None = no cap).
+    """
+    query = (text or "").strip()
+
+    if not query:
+        return False, "Search text is required.", []
+
+    if limit is not None and limit < 0:
+        return False, "Limit must be >= 0.", []
+
+    return True, "OK", [t.to_dict() for t in store.search(query, limit)]
@@ -4,6 +4,7 @@ Skill: toggle_task
 Purpose:
 - Flip is_completed for a task by id
 - Update updated_at timestamp
+- Bulk variant: toggle_tasks
 
 Rules:
 - Pure logic only
@@ -11,8 +12,8 @@ Rules:
 - In-memory behavior only (Phase-1)
 """
 
-from typing import Dict, Tuple, Any
-from store import find_task, now_iso
+from typing import Dict, Iterable, List, Set, Tuple, Any
+from store import store, find_task, now_us
 
 
 def toggle_task(task_id: str) -> Tuple[bool, str, Dict[str, Any]]:
@@ -35,8 +36,50 @@ def toggle_task(task_id: str) -> Tuple[bool, str, Dict[str, Any]]:
     if not task:
         return False, "Task not found.", {}
 
-    task["is_completed"] = not bool(task.get("is_completed"))
-    task["updated_at"] = now_iso()
+    # Goes through the store so the active/completed indexes stay in sync
+    store.set_completed(tid, not task.is_completed, now_us())
 
-    status = "completed" if task["is_completed"] else "active"
-    return True, f"Task marked {status}.", task
+    status = "completed" if task.is_completed else "active"
+    return True, f"Task marked {status}.", task.to_dict()
+
+
+def toggle_tasks(task_ids: Iterable[str]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+    """
+    Toggle completion state for many tasks in one call.
+
+    Returns:
+        one (ok, message, task) per input id, in input order
+
+    Notes:
+    - The whole batch is validated first (id present, exists, not
+      repeated in the batch), then valid ids are toggled in one pass.
+    - Invalid ids do not block valid ones; their item is {}.
+    """
+    checked: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for task_id in task_ids:
+        tid = (task_id or "").strip()
+        if not tid:
+            checked.append((tid, "Task id is required."))
+        elif tid in seen:
+            checked.append((tid, "Duplicate task id in batch."))
+        elif find_task(tid) is None:
+            checked.append((tid, "Task not found."))
+        else:
+            checked.append((tid, ""))
+        seen.add(tid)
+
+    ts = now_us()
+    results: List[Tuple[bool, str, Dict[str, Any]]] = []
+    for tid, error in checked:
+        if error:
+            results.append((False, error, {}))
+            continue
+
+        task = store.get(tid)
+        store.set_completed(tid, not task.is_completed, ts)
+
+        status = "completed" if task.is_completed else "active"
+        results.append((True, f"Task marked {status}.", task.to_dict()))
+
+    return results
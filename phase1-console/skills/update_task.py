@@ -12,7 +12,7 @@ Rules:
 """
 
 from typing import Dict, Tuple, Any
-from store import find_task, now_iso
+from store import store, now_us
 
 
 def _normalize_title(title: str) -> str:
@@ -47,11 +47,8 @@ def update_task(task_id: str, new_title: str) -> Tuple[bool, str, Dict[str, Any]
     if len(clean) > 80:
         return False, "Title too long (max 80).", {}
 
-    task = find_task(tid)
+    task = store.set_title(tid, clean, now_us())
     if not task:
         return False, "Task not found.", {}
 
-    task["title"] = clean
-    task["updated_at"] = now_iso()
-
-    return True, "Task updated.", task
+    return True, "Task updated.", task.to_dict()
@@ -8,18 +8,434 @@ Purpose:
 Rules:
 - No input(), no print()
 - No file I/O, no database
-- In-memory only (Phase-1)
+- In-memory only (Phase-1); durability is opt-in via journal.py,
+  which listens to store mutations through TaskStore.journal
 """
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, List, Optional, Set
+import time
 import uuid
 
+from search_index import TrigramIndex, normalize_title
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# ---------- Task entity ----------
+
+
+class Task:
+    """
+    Compact task record.
+
+    Notes:
+    - __slots__ avoids a per-instance __dict__ (much smaller than a dict).
+    - Timestamps are stored as UTC epoch microseconds (ints) and only
+      formatted to ISO 8601 when read (created_at / updated_at / to_dict).
+    """
+
+    __slots__ = ("id", "title", "is_completed", "created_at_us", "updated_at_us")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        is_completed: bool = False,
+        created_at_us: int = 0,
+        updated_at_us: int = 0,
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.is_completed = is_completed
+        self.created_at_us = created_at_us
+        self.updated_at_us = updated_at_us
+
+    @property
+    def created_at(self) -> str:
+        return format_epoch_us(self.created_at_us)
+
+    @property
+    def updated_at(self) -> str:
+        return format_epoch_us(self.updated_at_us)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Public task shape returned by skills (same keys as before).
+        """
+        return {
+            "id": self.id,
+            "title": self.title,
+            "is_completed": self.is_completed,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+# ---------- Status index ----------
+
+
+class SortedSeqs:
+    """
+    Sorted set of ints (task sequence numbers), stored in buckets.
+
+    Notes:
+    - A flat sorted list would pay an O(n) memmove per insert/delete;
+      buckets of at most 2 * BUCKET_SIZE values keep that to
+      O(log n + BUCKET_SIZE).
+    - Appending a new maximum (the newest task) is the common case.
+    """
+
+    BUCKET_SIZE = 1000
+
+    __slots__ = ("_buckets", "_maxes", "_len")
+
+    def __init__(self) -> None:
+        self._buckets: List[List[int]] = []
+        self._maxes: List[int] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._buckets)
+
+    def add(self, value: int) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        if not buckets:
+            buckets.append([value])
+            maxes.append(value)
+        else:
+            i = bisect_left(maxes, value)
+            if i == len(maxes):
+                i -= 1
+                buckets[i].append(value)
+                maxes[i] = value
+            else:
+                insort(buckets[i], value)
+
+            bucket = buckets[i]
+            if len(bucket) > 2 * self.BUCKET_SIZE:
+                half = bucket[self.BUCKET_SIZE:]
+                del bucket[self.BUCKET_SIZE:]
+                buckets.insert(i + 1, half)
+                maxes[i] = bucket[-1]
+                maxes.insert(i + 1, half[-1])
+        self._len += 1
+
+    def discard(self, value: int) -> None:
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            return
+        bucket = buckets[i]
+        j = bisect_left(bucket, value)
+        if j == len(bucket) or bucket[j] != value:
+            return
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            maxes[i] = bucket[-1]
+        else:
+            del buckets[i]
+            del maxes[i]
+
+    def slice(self, start: int, stop: Optional[int]) -> List[int]:
+        """
+        Values [start:stop] in order; skips whole buckets before `start`.
+        """
+        out: List[int] = []
+        for bucket in self._buckets:
+            size = len(bucket)
+            if start >= size:
+                start -= size
+                if stop is not None:
+                    stop -= size
+                continue
+            if stop is None:
+                out.extend(bucket[start:])
+            else:
+                out.extend(bucket[start:stop])
+                stop -= size
+                if stop <= 0:
+                    break
+            start = 0
+        return out
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._maxes.clear()
+        self._len = 0
+
+
+# ---------- Task store ----------
+
+
+class TaskStore:
+    """
+    Task container indexed by id.
+
+    Notes:
+    - Tasks live in a single dict keyed by id (O(1) lookup and delete).
+    - Python dicts keep insertion order, so iteration yields tasks
+      in the order they were added (same order as the old list).
+    - Every id gets an insertion sequence number. Active/completed
+      tasks are kept in secondary indexes: sorted sets of those numbers
+      (SortedSeqs), so filtered views list tasks in the same order as the
+      unfiltered view, filtered pages and counts cost O(result), and a
+      status change costs O(log n), with no re-sort on read.
+    - Change is_completed only through set_completed(), otherwise the
+      status indexes go stale.
+    - Holds Task objects; skills convert them with Task.to_dict().
+    - Titles are kept in a trigram index (search_index.py), updated on
+      add / set_title / remove, so search() avoids a full scan.
+    - If journal is set, every mutation is reported to it
+      (task_added / task_updated / task_removed / store_cleared).
+    """
+
+    def __init__(self) -> None:
+        self._by_id: Dict[str, Task] = {}
+        self._active = SortedSeqs()
+        self._completed = SortedSeqs()
+        self._seq: Dict[str, int] = {}
+        self._ids_by_seq: Dict[int, str] = {}
+        self._next_seq = 0
+        self._titles = TrigramIndex()
+        self.journal: Optional[Any] = None
+
+    def _status_index(self, is_completed: bool) -> SortedSeqs:
+        return self._completed if is_completed else self._active
+
+    def _enter_status(self, task_id: str, is_completed: bool) -> None:
+        self._status_index(is_completed).add(self._seq[task_id])
+
+    def _leave_status(self, task_id: str, is_completed: bool) -> None:
+        self._status_index(is_completed).discard(self._seq[task_id])
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._by_id
+
+    def add(self, task: Task) -> None:
+        """
+        Insert a task. The task must carry a unique id.
+        An existing task with the same id is replaced.
+        """
+        task_id = task.id
+        old = self._by_id.get(task_id)
+        if old is not None:
+            self._leave_status(task_id, old.is_completed)
+            self._titles.remove(task_id, old.title)
+        else:
+            self._seq[task_id] = self._next_seq
+            self._ids_by_seq[self._next_seq] = task_id
+            self._next_seq += 1
+
+        self._by_id[task_id] = task
+        self._enter_status(task_id, task.is_completed)
+        self._titles.add(task_id, task.title)
+
+        if self.journal is not None:
+            self.journal.task_added(task)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """
+        Return a task by id, or None if not found.
+        """
+        return self._by_id.get(task_id)
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        """
+        Remove a task by id and return it, or None if not found.
+        """
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._leave_status(task_id, task.is_completed)
+            del self._ids_by_seq[self._seq.pop(task_id)]
+            self._titles.remove(task_id, task.title)
+            if self.journal is not None:
+                self.journal.task_removed(task_id)
+        return task
+
+    def set_completed(
+        self, task_id: str, is_completed: bool, updated_at_us: int
+    ) -> Optional[Task]:
+        """
+        Set completion state and move the id between status indexes.
+        Returns the task, or None if not found.
+        """
+        task = self._by_id.get(task_id)
+        if task is None:
+            return None
+
+        was_completed = task.is_completed
+        if was_completed != is_completed:
+            self._leave_status(task_id, was_completed)
+            self._enter_status(task_id, is_completed)
+
+        task.is_completed = is_completed
+        task.updated_at_us = updated_at_us
+
+        if self.journal is not None:
+            self.journal.task_updated(task)
+        return task
+
+    def set_title(self, task_id: str, title: str, updated_at_us: int) -> Optional[Task]:
+        """
+        Replace a task title. Returns the task, or None if not found.
+        """
+        task = self._by_id.get(task_id)
+        if task is None:
+            return None
+
+        self._titles.replace(task_id, task.title, title)
+        task.title = title
+        task.updated_at_us = updated_at_us
+
+        if self.journal is not None:
+            self.journal.task_updated(task)
+        return task
+
+    def all(self) -> List[Task]:
+        """
+        Return all tasks in insertion order (shallow copy).
+        """
+        return list(self._by_id.values())
+
+    def iter_status(self, is_completed: Optional[bool] = None) -> Iterator[Task]:
+        """
+        Lazily yield tasks, optionally filtered by completion state.
+
+        Notes:
+        - Always insertion order; None means all tasks.
+        - Do not mutate the store while consuming the iterator.
+        """
+        if is_completed is None:
+            return iter(self._by_id.values())
+        by_id = self._by_id
+        ids = self._ids_by_seq
+        return (by_id[ids[seq]] for seq in self._status_index(is_completed))
+
+    def page(
+        self,
+        is_completed: Optional[bool] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """
+        Return one page of tasks, materializing only that page.
+        """
+        stop = None if limit is None else offset + limit
+        if is_completed is None:
+            return list(islice(self._by_id.values(), offset, stop))
+        by_id = self._by_id
+        ids = self._ids_by_seq
+        return [by_id[ids[seq]] for seq in self._status_index(is_completed).slice(offset, stop)]
+
+    def count(self, is_completed: Optional[bool] = None) -> int:
+        """
+        Count tasks, optionally filtered by completion state. O(1).
+        """
+        if is_completed is None:
+            return len(self._by_id)
+        return len(self._status_index(is_completed))
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[Task]:
+        """
+        Return tasks whose normalized title contains `text`.
+
+        Notes:
+        - Case-insensitive; whitespace runs count as one space.
+        - Results are in insertion order (same as the unfiltered listing),
+          and the walk stops once `limit` matches are verified.
+        - 3+ character queries use the trigram index (see
+          _indexed_in_order); shorter ones scan the store.
+        """
+        query = normalize_title(text)
+        if not query or limit == 0:
+            return []
+
+        by_id = self._by_id
+        postings = self._titles.postings(query)
+
+        if postings is None:
+            ordered: Iterator[Task] = iter(by_id.values())
+        elif not postings:
+            return []
+        else:
+            ordered = self._indexed_in_order(postings, walk_first=limit is not None)
+
+        matches: List[Task] = []
+        for task in ordered:
+            if query in normalize_title(task.title):
+                matches.append(task)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def _indexed_in_order(self, postings: List[Set[str]], walk_first: bool) -> Iterator[Task]:
+        """
+        Lazily yield tasks whose id is in every posting set, in insertion order.
+
+        Notes:
+        - walk_first (search has a limit): walk the store in order first,
+          skipping ids outside the postings, for at most len(rarest) / 8
+          steps (a fraction of the intersection cost it may save).
+          Common trigrams fill the limit early and the caller stops there.
+        - Otherwise (or once the walk budget is spent): intersect the
+          postings and sort the remaining ids by insertion sequence.
+        """
+        by_id = self._by_id
+        seq = self._seq
+        rarest, rest = postings[0], postings[1:]
+
+        last_seq = -1
+        if walk_first:
+            budget = len(rarest) // 8
+            for tid, task in by_id.items():
+                if budget == 0:
+                    break
+                budget -= 1
+                last_seq = seq[tid]
+                if tid in rarest and all(tid in other for other in rest):
+                    yield task
+            else:
+                return
+
+        ids = [tid for tid in rarest.intersection(*rest) if seq[tid] > last_seq]
+        ids.sort(key=seq.__getitem__)
+        for tid in ids:
+            yield by_id[tid]
+
+    def clear(self) -> None:
+        """
+        Remove every task.
+        """
+        self._by_id.clear()
+        self._active.clear()
+        self._completed.clear()
+        self._seq.clear()
+        self._ids_by_seq.clear()
+        self._titles.clear()
+
+        if self.journal is not None:
+            self.journal.store_cleared()
+
+
 # ---------- In-memory state ----------
 
-tasks: List[Dict[str, Any]] = []
+store = TaskStore()
 
 # ---------- helpers ----------
 
@@ -31,6 +447,21 @@ def now_iso() -> str:
     return datetime.utcnow().isoformat()
 
 
+def now_us() -> int:
+    """
+    Return the current UTC time as integer epoch microseconds.
+    """
+    return time.time_ns() // 1000
+
+
+def format_epoch_us(value: int) -> str:
+    """
+    Format epoch microseconds as a naive UTC ISO 8601 string
+    (same format as now_iso()).
+    """
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
 def generate_id() -> str:
     """
     Generate a unique id for a task.
@@ -38,11 +469,8 @@ def generate_id() -> str:
     return uuid.uuid4().hex
 
 
-def find_task(task_id: str) -> Optional[Dict[str, Any]]:
+def find_task(task_id: str) -> Optional[Task]:
     """
-    Find and return a task dict by id, or None if not found.
+    Find and return a task by id, or None if not found.
     """
-    for task in tasks:
-        if task.get("id") == task_id:
-            return task
-    return None
+    return store.get(task_id)
@@ -1,8 +1,11 @@
 # app/auth.py
 
+import asyncio
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -78,6 +81,85 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+# ============================================================
+# Password hashing pool (bounded; keeps bcrypt off the event loop)
+# - bcrypt releases the GIL, so a thread pool hashes in parallel
+# - PASSWORD_HASH_WORKERS: concurrent hashes (CPU-bound; ~= cores)
+# - PASSWORD_HASH_MAX_PENDING: running + queued hashes before new
+#   requests are rejected (PasswordPoolBusy -> 503 in routes)
+# ============================================================
+PASSWORD_HASH_WORKERS = _get_env_int("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = _get_env_int("PASSWORD_HASH_MAX_PENDING", 64)
+
+if PASSWORD_HASH_WORKERS <= 0:
+    raise RuntimeError("PASSWORD_HASH_WORKERS must be > 0")
+
+if PASSWORD_HASH_MAX_PENDING < PASSWORD_HASH_WORKERS:
+    raise RuntimeError("PASSWORD_HASH_MAX_PENDING must be >= PASSWORD_HASH_WORKERS")
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusy(RuntimeError):
+    """
+    Raised when the password hashing queue is full.
+    """
+
+
+class _PasswordPool:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy("Password hashing queue is full")
+            self.pending += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = _PasswordPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    hash_password on the bounded pool. Raises PasswordPoolBusy if full.
+    """
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """
+    verify_password on the bounded pool. Raises PasswordPoolBusy if full.
+    """
+    if not password or not hashed:
+        return False
+    return await password_pool.run(verify_password, password, hashed)
+
+
 # ============================================================
 # Token helpers (Auth gate)
 # ============================================================
@@ -104,17 +186,27 @@ def create_access_token(subject: str) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def decode_token(token: str) -> Optional[str]:
+def decode_token_claims(token: str) -> Optional[Dict[str, Any]]:
     """
-    Decode JWT and return subject (sub) if valid, otherwise None.
+    Decode JWT and return its claims if valid (signature + exp), otherwise None.
     """
     token = (token or "").strip()
     if not token:
         return None
 
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        sub = payload.get("sub")
-        return str(sub) if sub else None
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
+
+
+def decode_token(token: str) -> Optional[str]:
+    """
+    Decode JWT and return subject (sub) if valid, otherwise None.
+    """
+    payload = decode_token_claims(token)
+    if not payload:
+        return None
+
+    sub = payload.get("sub")
+    return str(sub) if sub else None
@@ -0,0 +1,73 @@
+# app/auth_cache.py
+
+"""
+Authentication caches (per process).
+
+- token_cache: raw JWT -> user_id (skips re-decoding; never outlives token exp)
+- user_cache:  user_id -> AuthUser snapshot (skips the per-request User SELECT)
+
+Invalidation:
+- ORM events on User (after_update / after_delete) drop the cached record,
+  so changed or deleted users are re-read (or rejected) on the next request.
+- Core-level bulk UPDATE/DELETE on the user table bypass ORM events;
+  call invalidate_user() after those.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlalchemy import event
+
+from .auth import _get_env_int
+from .cache import TTLCache
+from .models import User
+
+
+# ============================================================
+# Configuration (env, loaded once at import)
+# ============================================================
+AUTH_CACHE_TTL_SECONDS = _get_env_int("AUTH_CACHE_TTL_SECONDS", 60)
+AUTH_CACHE_MAX_ENTRIES = _get_env_int("AUTH_CACHE_MAX_ENTRIES", 10000)
+
+if AUTH_CACHE_TTL_SECONDS <= 0:
+    raise RuntimeError("AUTH_CACHE_TTL_SECONDS must be > 0")
+
+if AUTH_CACHE_MAX_ENTRIES <= 0:
+    raise RuntimeError("AUTH_CACHE_MAX_ENTRIES must be > 0")
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """
+    Authenticated user as seen by routes (not an ORM instance).
+    """
+    id: int
+    email: str
+
+
+token_cache: TTLCache[str, int] = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+user_cache: TTLCache[int, AuthUser] = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drop a cached user record (call after changing or deleting a user).
+    """
+    user_cache.pop(user_id)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+    }
+
+
+# ============================================================
+# ORM invalidation hooks
+# ============================================================
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target: User) -> None:
+    if target.id is not None:
+        invalidate_user(target.id)
@@ -1,9 +1,16 @@
 # app/database.py
 
 import os
-from typing import Generator
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Generator
 
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 # ============================================================
@@ -18,13 +25,219 @@ if not DATABASE_URL:
     )
 
 
+# Async drivers for the request path (same database, same URL otherwise)
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",  # psycopg 3: one driver, sync + async
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL to its async-driver equivalent.
+
+    - sqlite:///x.db                 -> sqlite+aiosqlite:///x.db
+    - postgresql[+psycopg2]://...    -> postgresql+psycopg://...
+    - postgresql+psycopg://...       -> unchanged (psycopg 3 is async-capable)
+    """
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for database backend: {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, str(default)).strip()
+    try:
+        return int(raw)
+    except ValueError:
+        raise RuntimeError(f"{name} must be an integer, got: {raw!r}")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "true" if default else "false").strip().lower()
+    if raw in {"1", "true", "yes", "on"}:
+        return True
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    raise RuntimeError(f"{name} must be true/false, got: {raw!r}")
+
+
+# ============================================================
+# Pool configuration (env, per engine; defaults = SQLAlchemy QueuePool)
+# - DB_POOL_SIZE:      persistent connections kept open
+# - DB_MAX_OVERFLOW:   extra connections opened under burst load
+# - DB_POOL_TIMEOUT:   seconds to wait for a free connection before erroring
+# - DB_POOL_RECYCLE:   reconnect connections older than N seconds (-1 = never)
+# - DB_POOL_PRE_PING:  true  = ping on every checkout (one extra round-trip)
+#                      false = optimistic; rely on DB_POOL_RECYCLE and the
+#                              pool's invalidate-on-disconnect instead
+# ============================================================
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", -1)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+if DB_POOL_SIZE <= 0:
+    raise RuntimeError("DB_POOL_SIZE must be > 0")
+
+if DB_MAX_OVERFLOW < -1:
+    raise RuntimeError("DB_MAX_OVERFLOW must be >= -1 (-1 = unlimited)")
+
+if DB_POOL_TIMEOUT <= 0:
+    raise RuntimeError("DB_POOL_TIMEOUT must be > 0")
+
+
+# ============================================================
+# Pool metrics
+# ============================================================
+
+class PoolMetrics:
+    """
+    Checkout counters for one engine's pool (thread-safe, per process).
+
+    checkout time = queue wait + new-connection / pre-ping time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def record_overflow(self) -> None:
+        with self._lock:
+            self.overflow_events += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_ms_avg": (self.wait_seconds_total / self.checkouts * 1000) if self.checkouts else 0.0,
+                "wait_ms_max": self.wait_seconds_max * 1000,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout and counts overflow connections / pool timeouts.
+    """
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def _create_connection(self):
+        record = super()._create_connection()
+        if self.overflow() > 0:
+            self.metrics.record_overflow()
+        return record
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _pool_kwargs(url: str, poolclass: type) -> Dict[str, Any]:
+    """
+    Engine pool arguments from env.
+    In-memory SQLite keeps SQLAlchemy's single-connection pool (no sizing).
+    """
+    kwargs: Dict[str, Any] = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return kwargs
+
+    kwargs.update(
+        poolclass=poolclass,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return kwargs
+
+
+# Sync engine: startup DDL, MCP tools, tests/scripts
 engine = create_engine(
     DATABASE_URL,
     echo=False,           # No SQL noise in production / tests
-    pool_pre_ping=True,   # Safer connections
+    **_pool_kwargs(DATABASE_URL, InstrumentedQueuePool),
+)
+
+# Async engine: FastAPI request path (no threadpool worker held per DB round-trip)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    **_pool_kwargs(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool),
 )
 
 
+def _engine_pool_stats(pool: Any) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            in_use=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=DB_MAX_OVERFLOW,
+        )
+    if isinstance(pool, _InstrumentedPoolMixin):
+        stats.update(pool.metrics.stats())
+    return stats
+
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    Live pool state + checkout counters for both engines (per process).
+    """
+    return {
+        "settings": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pre_ping": DB_POOL_PRE_PING,
+        },
+        "sync": _engine_pool_stats(engine.pool),
+        "async": _engine_pool_stats(async_engine.pool),
+    }
+
+
 # ============================================================
 # Lifecycle helpers
 # ============================================================
@@ -39,8 +252,27 @@ def create_db_and_tables() -> None:
 
 def get_session() -> Generator[Session, None, None]:
     """
-    Dependency-injected database session.
-    One session per request.
+    Sync database session (non-request code paths).
     """
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency-injected async database session.
+    One session per request.
+
+    expire_on_commit=False: returned ORM objects stay readable after commit
+    (an expired attribute would need an implicit, un-awaitable refresh).
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    """
+    Close pooled connections on shutdown.
+    """
+    await async_engine.dispose()
+    engine.dispose()
@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import create_db_and_tables
+from .database import create_db_and_tables, dispose_engines
 from .routes.auth_routes import router as auth_router
 from .routes.chat import router as chat_router
 from .routes.health import router as health_router
@@ -17,10 +17,11 @@ from .routes.chat_history import router as chat_history_router
 async def lifespan(app: FastAPI):
     """
     Application startup/shutdown lifecycle.
-    Spec-aligned: create DB tables on startup.
+    Spec-aligned: create DB tables on startup, release pools on shutdown.
     """
     create_db_and_tables()
     yield
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -54,6 +55,8 @@ app.add_middleware(
         "Origin",
         "X-Requested-With",
     ],
+    # Let browsers read the keyset pagination cursor on GET /api/tasks
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ============================================================
@@ -5,8 +5,10 @@ MCP Tool implementations - Phase III
 All tools are stateless and enforce owner-only access.
 """
 
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from sqlmodel import Session, select
 
@@ -22,6 +24,24 @@ from .schemas import (
 )
 
 
+# ============================================================
+# Injected context (optional)
+# ============================================================
+
+@dataclass(frozen=True)
+class ToolContext:
+    """
+    Caller-provided session and authenticated user for tool calls.
+
+    - session: owned by the caller (one connection for many tool calls);
+      tools commit on it but never close it
+    - user_id: owner already authenticated by the caller (JWT), so the
+      per-call User lookup is skipped
+    """
+    session: Session
+    user_id: int
+
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -43,6 +63,50 @@ def _validate_user(session: Session, user_id: str) -> User:
     return user
 
 
+@contextmanager
+def _tool_session(user_id: str, context: Optional[ToolContext]) -> Iterator[Tuple[Session, int]]:
+    """
+    Session + validated owner id for one tool call.
+
+    - No context: fresh Session(engine), user validated in the DB
+    - Context: caller's session and user (must match input user_id);
+      rolled back on error so the session stays usable for the next call,
+      and emptied after each call (the next one re-reads rows, never
+      identity-map leftovers)
+    """
+    if context is None:
+        with Session(engine) as session:
+            yield session, _validate_user(session, user_id).id
+        return
+
+    try:
+        user_id_int = int(user_id)
+    except ValueError:
+        raise ValueError(f"Invalid user_id format: {user_id}")
+
+    if user_id_int != context.user_id:
+        raise ValueError(f"User not found: {user_id}")
+
+    try:
+        yield context.session, context.user_id
+    except Exception:
+        context.session.rollback()
+        raise
+    finally:
+        context.session.expunge_all()
+
+
+def _commit(session: Session, context: Optional[ToolContext], *objects: Task) -> None:
+    """
+    Commit; reload server state only for tool-owned sessions
+    (injected sessions do not expire objects on commit).
+    """
+    session.commit()
+    if context is None:
+        for obj in objects:
+            session.refresh(obj)
+
+
 def _get_owned_task(session: Session, task_id: int, user_id: int) -> Task:
     """
     Fetch a task owned by the user.
@@ -92,20 +156,19 @@ def _validate_title(title: str) -> str:
 # MCP Tool Implementations
 # ============================================================
 
-def add_task_tool(input_data: AddTaskInput) -> ToolResponse:
+def add_task_tool(input_data: AddTaskInput, context: Optional[ToolContext] = None) -> ToolResponse:
     """
     Add a new task for the authenticated user.
 
     Args:
         input_data: AddTaskInput with user_id and title
+        context: Optional injected session + authenticated user
 
     Returns:
         ToolResponse with created task data
     """
     try:
-        with Session(engine) as session:
-            # Validate user exists
-            user = _validate_user(session, input_data.user_id)
+        with _tool_session(input_data.user_id, context) as (session, user_id):
 
             # Validate title
             title = _validate_title(input_data.title)
@@ -113,12 +176,11 @@ def add_task_tool(input_data: AddTaskInput) -> ToolResponse:
             # Create task
             task = Task(
                 title=title,
-                user_id=user.id,
+                user_id=user_id,
             )
 
             session.add(task)
-            session.commit()
-            session.refresh(task)
+            _commit(session, context, task)
 
             return ToolResponse(
                 ok=True,
@@ -140,23 +202,22 @@ def add_task_tool(input_data: AddTaskInput) -> ToolResponse:
         )
 
 
-def list_tasks_tool(input_data: ListTasksInput) -> ToolResponse:
+def list_tasks_tool(input_data: ListTasksInput, context: Optional[ToolContext] = None) -> ToolResponse:
     """
     List tasks for the authenticated user, optionally filtered by status.
 
     Args:
         input_data: ListTasksInput with user_id and optional status filter
+        context: Optional injected session + authenticated user
 
     Returns:
         ToolResponse with array of tasks
     """
     try:
-        with Session(engine) as session:
-            # Validate user exists
-            user = _validate_user(session, input_data.user_id)
+        with _tool_session(input_data.user_id, context) as (session, user_id):
 
             # Build query
-            query = select(Task).where(Task.user_id == user.id)
+            query = select(Task).where(Task.user_id == user_id)
 
             # Apply status filter
             if input_data.status == "pending":
@@ -190,31 +251,29 @@ def list_tasks_tool(input_data: ListTasksInput) -> ToolResponse:
         )
 
 
-def complete_task_tool(input_data: CompleteTaskInput) -> ToolResponse:
+def complete_task_tool(input_data: CompleteTaskInput, context: Optional[ToolContext] = None) -> ToolResponse:
     """
     Mark a task as completed (owner-only).
 
     Args:
         input_data: CompleteTaskInput with user_id and task_id
+        context: Optional injected session + authenticated user
 
     Returns:
         ToolResponse with updated task data
     """
     try:
-        with Session(engine) as session:
-            # Validate user exists
-            user = _validate_user(session, input_data.user_id)
+        with _tool_session(input_data.user_id, context) as (session, user_id):
 
             # Get owned task
-            task = _get_owned_task(session, input_data.task_id, user.id)
+            task = _get_owned_task(session, input_data.task_id, user_id)
 
             # Mark as completed
             task.is_completed = True
             task.updated_at = datetime.now(timezone.utc)
 
             session.add(task)
-            session.commit()
-            session.refresh(task)
+            _commit(session, context, task)
 
             return ToolResponse(
                 ok=True,
@@ -236,23 +295,22 @@ def complete_task_tool(input_data: CompleteTaskInput) -> ToolResponse:
         )
 
 
-def update_task_tool(input_data: UpdateTaskInput) -> ToolResponse:
+def update_task_tool(input_data: UpdateTaskInput, context: Optional[ToolContext] = None) -> ToolResponse:
     """
     Update a task's title (owner-only).
 
     Args:
         input_data: UpdateTaskInput with user_id, task_id, and new title
+        context: Optional injected session + authenticated user
 
     Returns:
         ToolResponse with updated task data
     """
     try:
-        with Session(engine) as session:
-            # Validate user exists
-            user = _validate_user(session, input_data.user_id)
+        with _tool_session(input_data.user_id, context) as (session, user_id):
 
             # Get owned task
-            task = _get_owned_task(session, input_data.task_id, user.id)
+            task = _get_owned_task(session, input_data.task_id, user_id)
 
             # Validate and update title
             title = _validate_title(input_data.title)
@@ -260,8 +318,7 @@ def update_task_tool(input_data: UpdateTaskInput) -> ToolResponse:
             task.updated_at = datetime.now(timezone.utc)
 
             session.add(task)
-            session.commit()
-            session.refresh(task)
+            _commit(session, context, task)
 
             return ToolResponse(
                 ok=True,
@@ -283,20 +340,19 @@ def update_task_tool(input_data: UpdateTaskInput) -> ToolResponse:
         )
 
 
-def delete_task_tool(input_data: DeleteTaskInput) -> ToolResponse:
+def delete_task_tool(input_data: DeleteTaskInput, context: Optional[ToolContext] = None) -> ToolResponse:
     """
     Delete a task (owner-only). Requires confirmation.
 
     Args:
         input_data: DeleteTaskInput with user_id, task_id, and confirm flag
+        context: Optional injected session + authenticated user
 
     Returns:
         ToolResponse with deleted task summary
     """
     try:
-        with Session(engine) as session:
-            # Validate user exists
-            user = _validate_user(session, input_data.user_id)
+        with _tool_session(input_data.user_id, context) as (session, user_id):
 
             # Check confirmation
             if not input_data.confirm:
@@ -307,7 +363,7 @@ def delete_task_tool(input_data: DeleteTaskInput) -> ToolResponse:
                 )
 
             # Get owned task
-            task = _get_owned_task(session, input_data.task_id, user.id)
+            task = _get_owned_task(session, input_data.task_id, user_id)
 
             # Capture task info before deletion
             task_info = {
@@ -318,7 +374,7 @@ def delete_task_tool(input_data: DeleteTaskInput) -> ToolResponse:
 
             # Delete task
             session.delete(task)
-            session.commit()
+            _commit(session, context)
 
             return ToolResponse(
                 ok=True,
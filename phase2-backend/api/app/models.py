@@ -1,10 +1,10 @@
 # app/models.py
 
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Literal, Optional, List
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlmodel import SQLModel, Field, Relationship, Column, DateTime
 
 
@@ -32,6 +32,11 @@ class User(SQLModel, table=True):
 
 
 class Task(SQLModel, table=True):
+    # Keyset pagination: GET /tasks walks (user_id, created_at, id) as an index range scan
+    __table_args__ = (
+        Index("ix_task_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
     # Owner-only law: every task must have an owner (NOT optional)
@@ -53,6 +58,14 @@ class Task(SQLModel, table=True):
     user: Optional["User"] = Relationship(back_populates="tasks")
 
 
+class TaskVersion(SQLModel, table=True):
+    # Per-user counter bumped in every transaction that changes the user's
+    # tasks (app/task_versions.py); shared by all workers via the DB
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+
+    version: int = Field(default=0, nullable=False)
+
+
 class Conversation(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
 
@@ -74,6 +87,11 @@ class Conversation(SQLModel, table=True):
 
 
 class Message(SQLModel, table=True):
+    # Chat history: last-N messages of a conversation read as a backward index range scan
+    __table_args__ = (
+        Index("ix_message_conversation_id_created_at", "conversation_id", "created_at"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
 
     # FK to conversation
@@ -94,6 +112,26 @@ class Message(SQLModel, table=True):
     )
 
 
+class ConversationSummary(SQLModel, table=True):
+    # Rolling summary of the messages folded out of the chat context window
+    conversation_id: UUID = Field(foreign_key="conversation.id", primary_key=True)
+
+    # Owner-only law: every summary must have an owner (NOT optional)
+    user_id: int = Field(foreign_key="user.id", index=True, nullable=False)
+
+    content: str = Field(default="", sa_column=Column(Text, nullable=False))
+
+    # created_at of the newest message covered by the summary
+    covered_until: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+
 # ============================================================
 # API SCHEMAS (Pydantic models)
 # ============================================================
@@ -109,3 +147,33 @@ class TaskRead(SQLModel):
     is_completed: bool
     created_at: datetime
     updated_at: datetime
+
+
+class BulkTaskOperation(SQLModel):
+    """
+    One item of POST /api/tasks/bulk.
+    - create: title
+    - update: id + title
+    - toggle / delete: id
+    """
+    op: Literal["create", "update", "toggle", "delete"]
+    id: Optional[int] = None
+    title: Optional[str] = None
+
+
+class BulkTaskRequest(SQLModel):
+    operations: List[BulkTaskOperation]
+
+
+class BulkTaskResult(SQLModel):
+    index: int
+    op: str
+    ok: bool
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
+    task: Optional[TaskRead] = None
+
+
+class BulkTaskResponse(SQLModel):
+    results: List[BulkTaskResult]
@@ -1,13 +1,23 @@
 # app/routes/auth_routes.py
 
+import time
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
+from ..database import get_async_session
 from ..models import User
-from ..auth import hash_password, verify_password, create_access_token, decode_token
+from ..auth import (
+    PasswordPoolBusy,
+    create_access_token,
+    decode_token_claims,
+    hash_password_async,
+    verify_password_async,
+)
+from ..auth_cache import AuthUser, token_cache, user_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -61,22 +71,67 @@ def _validate_register_payload(raw: dict) -> RegisterIn:
         return RegisterIn.parse_obj(raw)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session),
-) -> User:
-    sub = decode_token(token)
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _verify_or_503(password: str, hashed: str) -> bool:
+    try:
+        return await verify_password_async(password, hashed)
+    except PasswordPoolBusy:
+        raise _password_pool_busy()
+
+
+def _user_id_from_token(token: str) -> int:
+    """
+    Resolve the token subject to a user id.
+    Cached per token; a cache entry never outlives the token's exp.
+    """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    claims = decode_token_claims(token)
+    sub = claims.get("sub") if claims else None
     if not sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     try:
         user_id = int(sub)
-    except ValueError:
+    except (TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
 
-    user = session.exec(select(User).where(User.id == user_id)).first()
-    if not user:
+    exp = claims.get("exp")
+    ttl = (float(exp) - time.time()) if exp is not None else None
+    token_cache.set(token, user_id, ttl_seconds=ttl)
+    return user_id
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session),
+) -> AuthUser:
+    """
+    Authenticated user for the request.
+    Cache hit: no DB round-trip (the session never checks out a connection).
+    Cache miss: one SELECT of (id, email), then cached.
+    """
+    user_id = _user_id_from_token(token)
+
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    row = (await session.exec(select(User.id, User.email).where(User.id == user_id))).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    user = AuthUser(id=row[0], email=row[1])
+    user_cache.set(user_id, user)
     return user
 
 
@@ -130,7 +185,7 @@ async def _read_register_payload(request: Request) -> dict:
 # =========================
 
 @router.post("/register", response_model=RegisterOut, status_code=status.HTTP_201_CREATED)
-async def register(request: Request, session: Session = Depends(get_session)):
+async def register(request: Request, session: AsyncSession = Depends(get_async_session)):
     raw = await _read_register_payload(request)
     data = _validate_register_payload(raw)
 
@@ -144,25 +199,30 @@ async def register(request: Request, session: Session = Depends(get_session)):
         )
 
     # Pre-check (fast path)
-    existing = session.exec(select(User).where(User.email == email)).first()
+    existing = (await session.exec(select(User.id).where(User.email == email))).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    user = User(email=email, hashed_password=hash_password(password))
+    # bcrypt is CPU-bound: hashed on the bounded password pool, off the event loop
+    try:
+        hashed = await hash_password_async(password)
+    except PasswordPoolBusy:
+        raise _password_pool_busy()
+    user = User(email=email, hashed_password=hashed)
 
     try:
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
 
     except Exception:
-        session.rollback()
+        await session.rollback()
 
         # Handle race-condition / unique constraint safely
-        existing_after = session.exec(select(User).where(User.email == email)).first()
+        existing_after = (await session.exec(select(User.id).where(User.email == email))).first()
         if existing_after:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -179,15 +239,15 @@ async def register(request: Request, session: Session = Depends(get_session)):
 
 
 @router.post("/login", response_model=TokenOut)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     email = normalize_email(form_data.username)
     password = form_data.password or ""
 
-    user = session.exec(select(User).where(User.email == email)).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if not user or not await _verify_or_503(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -198,12 +258,12 @@ def login(
 
 
 @router.post("/login/json", response_model=TokenOut)
-def login_json(data: LoginIn, session: Session = Depends(get_session)):
+async def login_json(data: LoginIn, session: AsyncSession = Depends(get_async_session)):
     email = normalize_email(data.email)
     password = (data.password or "").strip()
 
-    user = session.exec(select(User).where(User.email == email)).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if not user or not await _verify_or_503(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -214,10 +274,10 @@ def login_json(data: LoginIn, session: Session = Depends(get_session)):
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: AuthUser = Depends(get_current_user)):
     return {"id": current_user.id, "email": current_user.email}
 
 
 @router.post("/logout")
-def logout():
+async def logout():
     return {"ok": True}
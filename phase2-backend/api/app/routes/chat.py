@@ -1,15 +1,19 @@
 # app/routes/chat.py
 
-from typing import Any, List, Optional
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
-from ..models import User
+from ..database import async_engine, get_async_session
 from ..services import chat_repo, chat_agent
+from ..auth_cache import AuthUser
 from .auth_routes import get_current_user
 
 
@@ -36,12 +40,134 @@ class ChatResponse(BaseModel):
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# SSE: no caching, and ask reverse proxies (nginx) not to buffer the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+# How often a blocking chat request checks whether its client is still there
+DISCONNECT_POLL_SECONDS = 0.5
+
+# nginx convention: client closed the connection before the response was ready
+CLIENT_CLOSED_REQUEST = 499
+
+T = TypeVar("T")
+
+
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await `awaitable`, cancelling it if the client disconnects first
+    (no point paying for LLM round-trips nobody will read).
+
+    Raises:
+        HTTPException 499: client disconnected (work was cancelled)
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST,
+                    detail="Client closed request",
+                )
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """
+    One Server-Sent Events frame.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class _Turn(NamedTuple):
+    conversation_id: UUID
+    is_new: bool             # conversation was created by this turn
+    received_at: datetime    # user message timestamp
+
+
+async def _start_turn(
+    session: AsyncSession,
+    payload: ChatRequest,
+    current_user: AuthUser,
+) -> _Turn:
+    """
+    Store the user message (and a new conversation) before the agent runs,
+    so it is kept even if the turn fails or the client goes away, and the
+    conversation ID handed to the client exists right away.
+    Shared by the blocking and streaming endpoints.
+
+    Raises:
+        HTTPException 404: Conversation not found or not owned by user
+    """
+    received_at = datetime.now(timezone.utc)
+    is_new = payload.conversation_id is None
+    conversation_id = uuid4() if is_new else payload.conversation_id
+
+    stored = await chat_repo.begin_turn(
+        session=session,
+        conversation_id=conversation_id,
+        user_id=current_user.id,
+        user_content=payload.message,
+        created_at=received_at,
+        create=is_new,
+    )
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found",  # Privacy-preserving message
+        )
+
+    return _Turn(conversation_id=conversation_id, is_new=is_new, received_at=received_at)
+
+
+async def _load_history(
+    session: AsyncSession,
+    turn: _Turn,
+    current_user: AuthUser,
+) -> Tuple[List[Dict[str, str]], Optional[chat_repo.PendingSummary]]:
+    if turn.is_new:
+        return [], None
+    # Prior messages only: the current one is passed to the agent separately
+    return await chat_agent.load_conversation_history(
+        session=session,
+        conversation_id=turn.conversation_id,
+        user_id=current_user.id,
+        before=turn.received_at,
+    )
+
+
+async def _finish_turn(
+    session: AsyncSession,
+    turn: _Turn,
+    user_id: int,
+    assistant_content: str,
+    summary: Optional[chat_repo.PendingSummary],
+) -> bool:
+    stored = await chat_repo.finish_turn(
+        session=session,
+        conversation_id=turn.conversation_id,
+        user_id=user_id,
+        assistant_content=assistant_content,
+        summary=summary,
+    )
+    return stored is not None
+
 
 @router.post("", response_model=ChatResponse, status_code=status.HTTP_200_OK)
-def chat_endpoint(
+async def chat_endpoint(
     payload: ChatRequest,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ) -> ChatResponse:
     """
     Chat endpoint with stateless, owner-only conversation persistence.
@@ -51,10 +177,12 @@ def chat_endpoint(
     - Owner-only: enforces JWT-based user_id for all operations
     - Identity injection: injects auth user_id into tool calls (never trusts AI)
     - Tool calling: uses MCP tools for task management
-    - Persistence: stores both user and assistant messages to DB
+    - Persistence: stores the user message before the agent runs, the
+      assistant message (+ summary update) in one transaction after
 
     Args:
         payload: ChatRequest with optional conversation_id and message
+        request: Raw request (agent is cancelled if the client disconnects)
         session: Database session (injected)
         current_user: Authenticated user (injected via JWT)
 
@@ -64,66 +192,32 @@ def chat_endpoint(
     Raises:
         HTTPException 404: Conversation not found or not owned by user
         HTTPException 422: Validation error (handled by FastAPI)
+        HTTPException 499: Client disconnected before the agent finished
     """
-    conversation_id = payload.conversation_id
-
-    # ============================================================
-    # CONVERSATION HANDLING
-    # ============================================================
-
-    if conversation_id is None:
-        # Create new conversation for this user
-        conversation = chat_repo.create_conversation(
-            session=session,
-            user_id=current_user.id,
-            title=None,  # Could be auto-generated from first message later
-        )
-        conversation_id = conversation.id
-
-    else:
-        # Verify conversation exists and belongs to current user
-        conversation = chat_repo.get_conversation_for_user(
-            session=session,
-            conversation_id=conversation_id,
-            user_id=current_user.id,
-        )
-        if not conversation:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Conversation not found",  # Privacy-preserving message
-            )
+    turn = await _start_turn(session, payload, current_user)
 
     # ============================================================
-    # STORE USER MESSAGE
+    # RUN AI AGENT (Stateless with Identity Injection)
     # ============================================================
 
-    user_message = chat_repo.add_message(
-        session=session,
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-        role="user",
-        content=payload.message,
-    )
+    history, summary = await _load_history(session, turn, current_user)
+    # End the read transaction: no pooled connection is held while the agent
+    # runs (finish_turn starts a fresh one)
+    await session.commit()
 
-    if not user_message:
-        # Should not happen since we verified conversation above
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to store message",
+    try:
+        assistant_response, tool_call_logs = await _cancel_on_disconnect(
+            request,
+            chat_agent.run_agent(
+                history=history,
+                user_id=current_user.id,  # Identity injection from JWT
+                user_message=payload.message,
+                preferred_language=payload.language,
+            ),
         )
 
-    # ============================================================
-    # RUN AI AGENT (Stateless with Identity Injection)
-    # ============================================================
-
-    try:
-      assistant_response, tool_call_logs = chat_agent.run_agent(
-        session=session,
-        conversation_id=conversation_id,
-        user_id=current_user.id,  # Identity injection from JWT
-        user_message=payload.message,
-        preferred_language=payload.language,
-    )
+    except HTTPException:
+        raise
 
     except Exception as e:
         # Log error and return graceful fallback
@@ -131,21 +225,13 @@ def chat_endpoint(
         tool_call_logs = []
 
     # ============================================================
-    # STORE ASSISTANT RESPONSE IN DB
+    # STORE ASSISTANT MESSAGE (+ summary update, one transaction)
     # ============================================================
 
-    assistant_message = chat_repo.add_message(
-        session=session,
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-        role="assistant",
-        content=assistant_response,
-    )
-
-    if not assistant_message:
+    if not await _finish_turn(session, turn, current_user.id, assistant_response, summary):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to store assistant response",
+            detail="Failed to store chat turn",
         )
 
     # ============================================================
@@ -153,7 +239,90 @@ def chat_endpoint(
     # ============================================================
 
     return ChatResponse(
-        conversation_id=conversation_id,
+        conversation_id=turn.conversation_id,
         response=assistant_response,
         tool_calls=tool_call_logs,
     )
+
+
+@router.post("/stream", status_code=status.HTTP_200_OK)
+async def chat_stream_endpoint(
+    payload: ChatRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Streaming variant of POST /api/chat (Server-Sent Events).
+
+    Same request body, ownership and persistence rules. Events:
+    - conversation: {"conversation_id"}                      first frame
+    - token:        {"content"}                              assistant text delta
+    - tool_call:    {"tool", "args"}                         before a tool runs
+    - tool_result:  {"tool", "result"}                       after it ran
+    - error:        {"detail"}                               agent failed (fallback text follows)
+    - done:         {"conversation_id", "response", "tool_calls"}  last frame
+
+    The user message is stored before the stream starts (the conversation
+    ID in the first frame already exists). History (and any summary fold)
+    is loaded after that frame, and the full assistant message is stored
+    once the agent finishes. Each step uses its own short-lived session, so
+    no pooled connection is held while the model runs; `done` is always
+    the last frame, even if a step fails.
+
+    Raises (before the stream starts):
+        HTTPException 404: Conversation not found or not owned by user
+    """
+    turn = await _start_turn(session, payload, current_user)
+    conversation_id = turn.conversation_id
+    user_id = current_user.id
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse("conversation", {"conversation_id": str(conversation_id)})
+
+        assistant_response = ""
+        tool_call_logs: List[Dict[str, Any]] = []
+        summary: Optional[chat_repo.PendingSummary] = None
+
+        # On client disconnect Starlette cancels this generator; the
+        # in-flight OpenAI stream is closed and nothing more is stored.
+        try:
+            # Own sessions: the stream outlives the request handler
+            async with AsyncSession(async_engine, expire_on_commit=False) as read_session:
+                history, summary = await _load_history(read_session, turn, current_user)
+
+            events = chat_agent.stream_agent(
+                history=history,
+                user_id=user_id,  # Identity injection from JWT
+                user_message=payload.message,
+                preferred_language=payload.language,
+            )
+            async for event in events:
+                if event["type"] == "done":
+                    assistant_response = event["response"]
+                    tool_call_logs = event["tool_calls"]
+                    continue
+                yield _sse(event["type"], {k: v for k, v in event.items() if k != "type"})
+
+        except Exception as e:
+            assistant_response = f"I apologize, but I encountered an error: {str(e)}"
+            yield _sse("error", {"detail": assistant_response})
+
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as write_session:
+                stored = await _finish_turn(write_session, turn, user_id, assistant_response, summary)
+        except Exception:
+            stored = False
+
+        if not stored:
+            yield _sse("error", {"detail": "Failed to store chat turn"})
+
+        yield _sse(
+            "done",
+            {
+                "conversation_id": str(conversation_id),
+                "response": assistant_response,
+                "tool_calls": tool_call_logs,
+            },
+        )
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
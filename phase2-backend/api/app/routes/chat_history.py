@@ -5,11 +5,11 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..database import get_session
-from ..models import User
+from ..database import get_async_session
 from ..services import chat_repo
+from ..auth_cache import AuthUser
 from .auth_routes import get_current_user
 
 
@@ -36,10 +36,10 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 
 
 @router.get("/history/{conversation_id}", response_model=ChatHistoryResponse, status_code=status.HTTP_200_OK)
-def get_chat_history(
+async def get_chat_history(
     conversation_id: UUID,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ) -> ChatHistoryResponse:
     """
     Get chat history for a specific conversation.
@@ -66,7 +66,7 @@ def get_chat_history(
     # ============================================================
 
     # Verify conversation exists and belongs to current user
-    conversation = chat_repo.get_conversation_for_user(
+    conversation = await chat_repo.get_conversation_for_user(
         session=session,
         conversation_id=conversation_id,
         user_id=current_user.id,
@@ -82,7 +82,7 @@ def get_chat_history(
     # LOAD MESSAGES (Ordered oldest -> newest)
     # ============================================================
 
-    messages = chat_repo.list_messages_for_conversation(
+    messages = await chat_repo.list_messages_for_conversation(
         session=session,
         conversation_id=conversation_id,
         user_id=current_user.id,
@@ -1,6 +1,14 @@
+from typing import Any, Dict
+
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from ..auth import password_pool
+from ..auth_cache import cache_stats
+from ..database import pool_stats
+from ..services import chat_cache
+from ..services.chat_agent import fast_path_stats, prompt_usage
+
 router = APIRouter(tags=["health"])
 
 
@@ -15,3 +23,18 @@ def health():
     Used for liveness / sanity verification.
     """
     return {"ok": True}
+
+
+@router.get("/metrics")
+def metrics() -> Dict[str, Any]:
+    """
+    In-process runtime counters (per worker process).
+    """
+    return {
+        "auth_cache": cache_stats(),
+        "db_pool": pool_stats(),
+        "password_pool": password_pool.stats(),
+        "llm_prompt": prompt_usage.stats(),
+        "chat_fast_path": fast_path_stats.stats(),
+        "chat_response_cache": chat_cache.cache_stats(),
+    }
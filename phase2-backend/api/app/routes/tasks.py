@@ -1,43 +1,92 @@
+import base64
+import json
 from datetime import datetime
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select
-
-from ..database import get_session
-from ..models import Task, TaskCreate, TaskRead, User
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import bindparam, delete, not_, tuple_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..database import get_async_session
+from ..models import (
+    BulkTaskOperation,
+    BulkTaskRequest,
+    BulkTaskResponse,
+    Task,
+    TaskCreate,
+    TaskRead,
+)
+from ..auth_cache import AuthUser
+from ..task_versions import bump_task_version
 from .auth_routes import get_current_user
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+# Response header carrying the opaque cursor for the next page (absent on last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Upper bound on operations per POST /tasks/bulk request
+MAX_BULK_OPERATIONS = 500
+
+# Columns returned by mutation statements (TaskRead shape)
+_TASK_COLUMNS = (
+    Task.id,
+    Task.user_id,
+    Task.title,
+    Task.is_completed,
+    Task.created_at,
+    Task.updated_at,
+)
+
 
 # ============================================================
 # Helpers (pure, deterministic, spec-aligned)
 # ============================================================
 
-def _get_owned_task_or_404(
+def _task_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Task not found",
+    )
+
+
+async def _update_owned_task_or_404(
     *,
-    session: Session,
+    session: AsyncSession,
     task_id: int,
-    current_user: User,
-) -> Task:
+    current_user: AuthUser,
+    values: Dict[str, Any],
+) -> Dict[str, Any]:
     """
-    Fetch a task owned by the current user.
+    Owner-scoped single-statement UPDATE, then commit.
     Privacy-preserving: returns 404 if not found or not owned.
+
+    - RETURNING supported: one UPDATE ... WHERE id=? AND user_id=? RETURNING
+    - Otherwise (e.g. SQLite < 3.35): UPDATE, then SELECT in the same transaction
     """
-    task = session.exec(
-        select(Task)
+    statement = (
+        update(Task)
         .where(Task.id == task_id)
         .where(Task.user_id == current_user.id)
-    ).first()
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found",
-        )
+    if session.bind.dialect.update_returning:
+        row = (await session.exec(statement.returning(*_TASK_COLUMNS))).first()
+    else:
+        row = None
+        if (await session.exec(statement)).rowcount:
+            row = (await session.exec(select(*_TASK_COLUMNS).where(Task.id == task_id))).first()
 
-    return task
+    if row is None:
+        await session.rollback()
+        raise _task_not_found()
+
+    await bump_task_version(session, current_user.id)  # Core UPDATE: no ORM event
+    await session.commit()
+    return dict(row._mapping)
 
 
 def _validate_title_or_400(raw_title: str | None) -> str:
@@ -64,12 +113,59 @@ def _validate_title_or_400(raw_title: str | None) -> str:
     return title
 
 
-def _touch_updated_at(task: Task) -> None:
+def _encode_cursor(task: Task) -> str:
+    """
+    Opaque keyset cursor for the position *after* this task.
+    Encodes (created_at, id) as URL-safe base64 JSON.
+    """
+    raw = json.dumps({"c": task.created_at.isoformat(), "i": task.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor_or_400(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by _encode_cursor.
+    Raises 400 if it is malformed.
     """
-    Update mutation timestamp.
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _bulk_result(
+    index: int,
+    item: BulkTaskOperation,
+    status_code: int,
+    *,
+    detail: Optional[str] = None,
+    task: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    One entry of the bulk response (kept in request order).
+    """
+    return {
+        "index": index,
+        "op": item.op,
+        "ok": status_code < 400,
+        "status": status_code,
+        "id": task["id"] if task else item.id,
+        "detail": detail,
+        "task": task,
+    }
+
+
+def _mutation_timestamp() -> datetime:
+    """
+    updated_at value for mutations.
     created_at is assumed to be handled by model defaults.
     """
-    task.updated_at = datetime.utcnow()
+    return datetime.utcnow()
 
 
 # ============================================================
@@ -77,32 +173,50 @@ def _touch_updated_at(task: Task) -> None:
 # ============================================================
 
 @router.get("", response_model=List[TaskRead])
-def list_tasks(
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+async def list_tasks(
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
     offset: int = Query(default=0, ge=0),
     limit: int = Query(default=100, le=100),
+    cursor: Optional[str] = Query(default=None),
 ):
     """
     List tasks owned by the current user.
-    Ordered by newest first.
+    Ordered by newest first (created_at desc, id desc).
+
+    Pagination:
+    - cursor (preferred): pass the X-Next-Cursor header value from the
+      previous page; each page is an index range scan on
+      (user_id, created_at, id), no matter how deep.
+    - offset: still supported (slower for deep pages).
     """
+    statement = select(Task).where(Task.user_id == current_user.id)
+
+    if cursor:
+        created_at, task_id = _decode_cursor_or_400(cursor)
+        statement = statement.where(tuple_(Task.created_at, Task.id) < (created_at, task_id))
+
     statement = (
-        select(Task)
-        .where(Task.user_id == current_user.id)
-        .order_by(Task.created_at.desc())
+        statement
+        .order_by(Task.created_at.desc(), Task.id.desc())
         .offset(offset)
         .limit(limit)
     )
 
-    return session.exec(statement).all()
+    tasks = (await session.exec(statement)).all()
+
+    if tasks and len(tasks) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(tasks[-1])
+
+    return tasks
 
 
 @router.post("", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     payload: TaskCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Create a new task for the authenticated user.
@@ -115,75 +229,223 @@ def create_task(
     )
 
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.commit()
+    await session.refresh(task)
     return task
 
 
+@router.post("/bulk", response_model=BulkTaskResponse)
+async def bulk_tasks(
+    payload: BulkTaskRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """
+    Apply a batch of create / update / toggle / delete operations
+    for the authenticated user in ONE transaction.
+
+    Rules:
+    - Each item is checked on its own (same title rules as the single routes);
+      invalid or not-owned items get a 400/404 result and are skipped,
+      the rest are applied.
+    - A task id may appear at most once across update/toggle/delete.
+    - Results are returned per item, in request order.
+
+    Statements per request are fixed, not per item:
+    ownership SELECT, multi-row INSERT, executemany UPDATE (titles),
+    UPDATE ... IN (toggles), DELETE ... IN, SELECT (changed rows).
+    """
+    operations = payload.operations
+    if len(operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many operations (max {MAX_BULK_OPERATIONS})",
+        )
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    creates: List[Tuple[int, Task]] = []
+    index_by_id: Dict[int, int] = {}
+    new_titles: Dict[int, str] = {}
+
+    # 1) Validate items (no DB)
+    for index, item in enumerate(operations):
+        try:
+            title = None
+            if item.op in ("create", "update"):
+                title = _validate_title_or_400(item.title)
+
+            if item.op != "create":
+                if item.id is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Task id is required",
+                    )
+                if item.id in index_by_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Duplicate task id in batch",
+                    )
+        except HTTPException as exc:
+            results[index] = _bulk_result(index, item, exc.status_code, detail=exc.detail)
+            continue
+
+        if item.op == "create":
+            creates.append((index, Task(title=title, user_id=current_user.id)))
+            continue
+
+        index_by_id[item.id] = index
+        if item.op == "update":
+            new_titles[item.id] = title
+
+    # 2) Ownership in one SELECT (privacy-preserving 404 for the rest)
+    owned: Set[int] = set()
+    if index_by_id:
+        owned = set(
+            (await session.exec(
+                select(Task.id)
+                .where(Task.user_id == current_user.id)
+                .where(Task.id.in_(list(index_by_id)))
+            )).all()
+        )
+
+    for task_id, index in list(index_by_id.items()):
+        if task_id not in owned:
+            results[index] = _bulk_result(
+                index, operations[index], status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+            del index_by_id[task_id]
+            new_titles.pop(task_id, None)
+
+    toggle_ids = [i for i, idx in index_by_id.items() if operations[idx].op == "toggle"]
+    delete_ids = [i for i, idx in index_by_id.items() if operations[idx].op == "delete"]
+    stamp = _mutation_timestamp()
+
+    # 3) Creates: one multi-row INSERT (ORM batches add_all on flush)
+    if creates:
+        session.add_all([task for _, task in creates])
+        await session.flush()
+        for index, task in creates:
+            row = {column.key: getattr(task, column.key) for column in _TASK_COLUMNS}
+            results[index] = _bulk_result(
+                index, operations[index], status.HTTP_201_CREATED, task=row
+            )
+
+    # 4) Title updates: one executemany UPDATE (per-row titles)
+    if new_titles:
+        table = Task.__table__
+        await session.exec(
+            update(table)
+            .where(table.c.id == bindparam("task_id"))
+            .where(table.c.user_id == current_user.id)
+            .values(title=bindparam("new_title"), updated_at=stamp),
+            params=[{"task_id": i, "new_title": t} for i, t in new_titles.items()],
+        )
+
+    # 5) Toggles: one UPDATE ... WHERE id IN (...)
+    if toggle_ids:
+        await session.exec(
+            update(Task)
+            .where(Task.user_id == current_user.id)
+            .where(Task.id.in_(toggle_ids))
+            .values(is_completed=not_(Task.is_completed), updated_at=stamp)
+            .execution_options(synchronize_session=False)
+        )
+
+    # 6) Deletes: one DELETE ... WHERE id IN (...)
+    if delete_ids:
+        await session.exec(
+            delete(Task)
+            .where(Task.user_id == current_user.id)
+            .where(Task.id.in_(delete_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for task_id in delete_ids:
+            index = index_by_id[task_id]
+            results[index] = _bulk_result(index, operations[index], status.HTTP_204_NO_CONTENT)
+
+    # 7) Read back changed rows in one SELECT
+    changed_ids = list(new_titles) + toggle_ids
+    if changed_ids:
+        rows = {
+            row.id: dict(row._mapping)
+            for row in await session.exec(select(*_TASK_COLUMNS).where(Task.id.in_(changed_ids)))
+        }
+        for task_id in changed_ids:
+            index = index_by_id[task_id]
+            row = rows.get(task_id)
+            if row is None:
+                # deleted concurrently between the ownership check and the update
+                results[index] = _bulk_result(
+                    index, operations[index], status.HTTP_404_NOT_FOUND, detail="Task not found"
+                )
+            else:
+                results[index] = _bulk_result(index, operations[index], status.HTTP_200_OK, task=row)
+
+    if any(result["ok"] for result in results):
+        await bump_task_version(session, current_user.id)  # Core UPDATE/DELETE: no ORM event
+    await session.commit()
+    return {"results": results}
+
+
 @router.put("/{task_id}", response_model=TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     payload: TaskCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Update task title (owner-only).
     """
-    task = _get_owned_task_or_404(
+    title = _validate_title_or_400(payload.title)
+
+    return await _update_owned_task_or_404(
         session=session,
         task_id=task_id,
         current_user=current_user,
+        values={"title": title, "updated_at": _mutation_timestamp()},
     )
 
-    task.title = _validate_title_or_400(payload.title)
-    _touch_updated_at(task)
-
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-    return task
-
 
 @router.patch("/{task_id}/toggle", response_model=TaskRead)
-def toggle_task(
+async def toggle_task(
     task_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Toggle task completion status (owner-only).
+    Flipped in SQL (SET is_completed = NOT is_completed), so no read first.
     """
-    task = _get_owned_task_or_404(
+    return await _update_owned_task_or_404(
         session=session,
         task_id=task_id,
         current_user=current_user,
+        values={"is_completed": not_(Task.is_completed), "updated_at": _mutation_timestamp()},
     )
 
-    task.is_completed = not task.is_completed
-    _touch_updated_at(task)
-
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-    return task
-
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthUser = Depends(get_current_user),
 ):
     """
     Delete a task owned by the current user.
+    Single owner-scoped DELETE; rowcount tells us whether it existed.
     """
-    task = _get_owned_task_or_404(
-        session=session,
-        task_id=task_id,
-        current_user=current_user,
+    result = await session.exec(
+        delete(Task)
+        .where(Task.id == task_id)
+        .where(Task.user_id == current_user.id)
+        .execution_options(synchronize_session=False)
     )
 
-    session.delete(task)
-    session.commit()
+    if not result.rowcount:
+        await session.rollback()
+        raise _task_not_found()
+
+    await bump_task_version(session, current_user.id)  # Core DELETE: no ORM event
+    await session.commit()
     return None
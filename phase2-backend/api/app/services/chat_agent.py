@@ -2,7 +2,7 @@
 
 """
 Stateless AI Agent for Phase III Chat
-- Uses OpenAI SDK tool calling with MCP tool integration
+- Uses OpenAI SDK tool calling with MCP tool integration (AsyncOpenAI, per-call timeout)
 - Loads conversation history from DB (stateless)
 - Implements identity injection for user_id
 - No in-memory state between requests
@@ -11,19 +11,31 @@ Safe additive hybrid:
 - Optional preferred_language ("en"|"ur") accepted by run_agent (defaults to English)
 - Heuristic Urdu detection if preferred_language missing (handled in language_router_skill)
 - Intent hint (add/list/complete/update/delete) used only as prompt steering (NO behavior change)
+- Opt-in fast path (CHAT_FAST_PATH): plain add/list/complete commands skip the LLM
+- Read-only list turns are answered from chat_cache until the user's tasks change
 - Reusable Intelligence: skills/ modules used (language_router_skill + task_intent_skill)
 """
 
+import asyncio
 import json
 import os
-from typing import Any, Dict, List, Tuple, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Hashable, List, Tuple, Optional
 from uuid import UUID
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from . import chat_repo
+from . import chat_cache
+from .chat_context import build_context_window
+from .chat_repo import PendingSummary
+from ..database import engine
 from ..mcp_tools.tools import (
+    ToolContext,
     add_task_tool,
     list_tasks_tool,
     complete_task_tool,
@@ -41,6 +53,7 @@ from ..mcp_tools.schemas import (
 # Reusable Intelligence (skills)
 from .skills.language_router_skill import resolve_language
 from .skills.task_intent_skill import detect_intent
+from .skills.fast_path_skill import match_command, render_reply
 
 
 # ============================================================
@@ -55,7 +68,36 @@ if not OPENAI_API_KEY:
 
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")
 
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# Per OpenAI call (connect + each read); retries only on connection errors / 429 / 5xx
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "30"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+if OPENAI_TIMEOUT_SECONDS <= 0:
+    raise RuntimeError("OPENAI_TIMEOUT_SECONDS must be > 0")
+
+# Tool calls from one model turn run concurrently on this many threads (process-wide)
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", "4"))
+
+if TOOL_WORKERS <= 0:
+    raise RuntimeError("TOOL_WORKERS must be > 0")
+
+# Tool calls of one model turn. Trade-off between turn latency and DB connections:
+# false = independent calls run concurrently, one session/connection per lane
+#         (a turn with k independent calls checks out k connections at once)
+# true  = every call runs in order on ONE session/connection (one checkout per
+#         turn; the turn takes as long as all its calls combined)
+TOOL_SHARED_SESSION = os.getenv("TOOL_SHARED_SESSION", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+# Opt-in: plain add/list/complete commands run their tool directly, no LLM call
+CHAT_FAST_PATH = os.getenv("CHAT_FAST_PATH", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+# Async client: an in-flight LLM call holds no thread, and is cancelled
+# with the request task (OPENAI_BASE_URL env is honoured by the SDK)
+openai_client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    timeout=OPENAI_TIMEOUT_SECONDS,
+    max_retries=OPENAI_MAX_RETRIES,
+)
 
 SYSTEM_PROMPT = """You are a helpful task management assistant. You can help users:
 - Create tasks (add_task)
@@ -82,135 +124,156 @@ Be concise and helpful."""
 # SAFE ADDITIVE PROMPT STEERING (uses reusable skills)
 # ============================================================
 
+# Stable per-language prompt prefix, built once. Kept byte-identical across
+# requests (nothing per-request in it) so the provider's prompt cache can
+# reuse tools + system prompt + history; per-request hints go after history.
+_LANGUAGE_MODES = {
+    "ur": (
+        "\n\nLANGUAGE MODE: Urdu\n"
+        "You MUST respond in Urdu. Tool names/arguments remain unchanged.\n"
+    ),
+    "en": "\n\nLANGUAGE MODE: English\n",
+}
+
+SYSTEM_PROMPTS: Dict[str, str] = {
+    lang: SYSTEM_PROMPT + mode for lang, mode in _LANGUAGE_MODES.items()
+}
+
+
 def build_system_prompt(preferred_language: Optional[str], user_message: str) -> str:
     """
     Language-aware system prompt that does NOT change tool behavior.
     Only affects the language of assistant responses.
+    Returns one of the precomputed SYSTEM_PROMPTS (identical per language).
     """
     lang = resolve_language(preferred_language, user_message)
-    intent = detect_intent(user_message)
-
-    if lang == "ur":
-        return (
-            SYSTEM_PROMPT
-            + "\n\nLANGUAGE MODE: Urdu\n"
-            + "You MUST respond in Urdu. Tool names/arguments remain unchanged.\n"
-            + f"Intent hint (optional): {intent}\n"
-        )
+    return SYSTEM_PROMPTS["ur" if lang == "ur" else "en"]
 
-    return (
-        SYSTEM_PROMPT
-        + "\n\nLANGUAGE MODE: English\n"
-        + f"Intent hint (optional): {intent}\n"
-    )
+
+def intent_hint_message(user_message: str) -> Dict[str, str]:
+    """
+    Per-request intent hint, sent right before the user message
+    (after the cacheable prefix).
+    """
+    return {"role": "system", "content": f"Intent hint (optional): {detect_intent(user_message)}"}
 
 
 # ============================================================
 # TOOL DEFINITIONS
 # ============================================================
 
-def get_tool_definitions() -> List[Dict[str, Any]]:
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "add_task",
-                "description": "Create a new task for the user",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string", "description": "Task title (max 80 characters)"},
-                    },
-                    "required": ["title"],
+# Built once at import; read-only (passed as-is to every OpenAI call)
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "add_task",
+            "description": "Create a new task for the user",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "description": "Task title (max 80 characters)"},
                 },
+                "required": ["title"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "list_tasks",
-                "description": "List tasks with optional status filter",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "status": {
-                            "type": "string",
-                            "enum": ["all", "pending", "completed"],
-                            "description": "Filter by status (default: all)",
-                        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_tasks",
+            "description": "List tasks with optional status filter",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "status": {
+                        "type": "string",
+                        "enum": ["all", "pending", "completed"],
+                        "description": "Filter by status (default: all)",
                     },
                 },
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "complete_task",
-                "description": "Mark a task as completed",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {"type": "integer", "description": "Task ID to complete"},
-                    },
-                    "required": ["task_id"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "complete_task",
+            "description": "Mark a task as completed",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {"type": "integer", "description": "Task ID to complete"},
                 },
+                "required": ["task_id"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "update_task",
-                "description": "Update a task's title",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {"type": "integer", "description": "Task ID to update"},
-                        "title": {"type": "string", "description": "New task title (max 80 characters)"},
-                    },
-                    "required": ["task_id", "title"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "update_task",
+            "description": "Update a task's title",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {"type": "integer", "description": "Task ID to update"},
+                    "title": {"type": "string", "description": "New task title (max 80 characters)"},
                 },
+                "required": ["task_id", "title"],
             },
         },
-        {
-            "type": "function",
-            "function": {
-                "name": "delete_task",
-                "description": "Delete a task (requires user confirmation first)",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "task_id": {"type": "integer", "description": "Task ID to delete"},
-                        "confirm": {"type": "boolean", "description": "Confirmation flag (must be true)"},
-                    },
-                    "required": ["task_id", "confirm"],
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_task",
+            "description": "Delete a task (requires user confirmation first)",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "task_id": {"type": "integer", "description": "Task ID to delete"},
+                    "confirm": {"type": "boolean", "description": "Confirmation flag (must be true)"},
                 },
+                "required": ["task_id", "confirm"],
             },
         },
-    ]
+    },
+]
+
+
+def get_tool_definitions() -> List[Dict[str, Any]]:
+    return TOOL_DEFINITIONS
 
 
 # ============================================================
 # TOOL EXECUTION (Identity Injection)
 # ============================================================
 
-def execute_tool(tool_name: str, tool_args: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+def execute_tool(
+    tool_name: str,
+    tool_args: Dict[str, Any],
+    user_id: int,
+    context: Optional[ToolContext] = None,
+) -> Dict[str, Any]:
     """
     CRITICAL: user_id is derived from JWT by backend, never from AI.
+    context: optional shared session (see _run_tool_batch); its user_id is the same JWT user.
     """
     user_id_str = str(user_id)
 
     try:
         if tool_name == "add_task":
             input_data = AddTaskInput(user_id=user_id_str, title=tool_args.get("title", ""))
-            result = add_task_tool(input_data)
+            result = add_task_tool(input_data, context)
 
         elif tool_name == "list_tasks":
             input_data = ListTasksInput(user_id=user_id_str, status=tool_args.get("status", "all"))
-            result = list_tasks_tool(input_data)
+            result = list_tasks_tool(input_data, context)
 
         elif tool_name == "complete_task":
             input_data = CompleteTaskInput(user_id=user_id_str, task_id=tool_args.get("task_id"))
-            result = complete_task_tool(input_data)
+            result = complete_task_tool(input_data, context)
 
         elif tool_name == "update_task":
             input_data = UpdateTaskInput(
@@ -218,7 +281,7 @@ def execute_tool(tool_name: str, tool_args: Dict[str, Any], user_id: int) -> Dic
                 task_id=tool_args.get("task_id"),
                 title=tool_args.get("title", ""),
             )
-            result = update_task_tool(input_data)
+            result = update_task_tool(input_data, context)
 
         elif tool_name == "delete_task":
             input_data = DeleteTaskInput(
@@ -226,7 +289,7 @@ def execute_tool(tool_name: str, tool_args: Dict[str, Any], user_id: int) -> Dic
                 task_id=tool_args.get("task_id"),
                 confirm=tool_args.get("confirm", False),
             )
-            result = delete_task_tool(input_data)
+            result = delete_task_tool(input_data, context)
 
         else:
             return {"ok": False, "message": f"Unknown tool: {tool_name}", "data": None}
@@ -241,93 +304,421 @@ def execute_tool(tool_name: str, tool_args: Dict[str, Any], user_id: int) -> Dic
 # CONVERSATION HISTORY
 # ============================================================
 
-def load_conversation_history(session: Session, conversation_id: UUID, user_id: int) -> List[Dict[str, str]]:
-    messages = chat_repo.list_messages_for_conversation(
+async def load_conversation_history(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    before: Optional[datetime] = None,
+) -> Tuple[List[Dict[str, str]], Optional[PendingSummary]]:
+    """
+    Token-budgeted history: rolling summary + newest messages created
+    before `before` (at most MAX_HISTORY_MESSAGES, see chat_context).
+    Returns the history and the summary update to store with the turn.
+    """
+    return await build_context_window(
         session=session,
         conversation_id=conversation_id,
         user_id=user_id,
+        max_messages=MAX_HISTORY_MESSAGES,
+        client=openai_client,
+        model=AI_MODEL,
+        before=before,
     )
 
-    messages = messages[-MAX_HISTORY_MESSAGES:]
 
-    return [{"role": msg.role, "content": msg.content} for msg in messages]
+# ============================================================
+# AGENT EXECUTION
+# ============================================================
+
+MAX_ITERATIONS = 5
+
+
+class PromptUsage:
+    """
+    Prompt token counters from OpenAI `usage` (thread-safe, per process).
+    cached_tokens = prompt tokens served from the provider's prefix cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, usage: Any) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.cached_tokens += (getattr(details, "cached_tokens", None) or 0)
+            self.completion_tokens += usage.completion_tokens or 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": (self.cached_tokens / self.prompt_tokens) if self.prompt_tokens else 0.0,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+prompt_usage = PromptUsage()
+
+TOO_MANY_TOOL_CALLS_MESSAGE = (
+    "I apologize, but I encountered too many tool calls. Please try rephrasing your request."
+)
+
+
+def _build_messages(
+    history: List[Dict[str, str]],
+    user_message: str,
+    preferred_language: Optional[str],
+) -> List[Dict[str, Any]]:
+    return [
+        {"role": "system", "content": build_system_prompt(preferred_language, user_message)},
+        *history,
+        intent_hint_message(user_message),
+        {"role": "user", "content": user_message},
+    ]
+
+
+def _assistant_tool_call_message(content: Optional[str], tool_calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    tool_calls: [{"id", "name", "arguments"}] (arguments = raw JSON string)
+    """
+    return {
+        "role": "assistant",
+        "content": content,
+        "tool_calls": [
+            {
+                "id": tc["id"],
+                "type": "function",
+                "function": {"name": tc["name"], "arguments": tc["arguments"]},
+            }
+            for tc in tool_calls
+        ],
+    }
+
+
+def _tool_result_message(tool_call_id: str, tool_result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "role": "tool",
+        "tool_call_id": tool_call_id,
+        "content": json.dumps(tool_result),
+    }
+
+
+# Tools that change one task (identified by task_id)
+MUTATING_TOOLS = {"complete_task", "update_task", "delete_task"}
+
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="chat-tool")
+
+
+def _tool_lane(index: int, tool_name: str, tool_args: Dict[str, Any]) -> Hashable:
+    """
+    Calls in the same lane run in order; lanes run concurrently.
+    - mutations of one task_id share a lane (no racing update vs delete)
+    - everything else (reads, add_task) gets its own lane
+    """
+    task_id = tool_args.get("task_id")
+    if tool_name in MUTATING_TOOLS and task_id is not None:
+        return ("task", str(task_id))
+    return ("call", index)
+
+
+def _run_tool_batch(tool_calls: List[Tuple[str, Dict[str, Any]]], user_id: int) -> List[Dict[str, Any]]:
+    """
+    Tool calls (one lane, or a whole turn with TOOL_SHARED_SESSION), in
+    order, on ONE Session bound to ONE pooled connection, with the JWT user as pre-validated context (no per-call
+    User lookup). Each tool still commits its own change, so a failing
+    call cannot undo one already reported to the model. The connection is
+    released before the next model call.
+    """
+    with engine.connect() as connection, Session(bind=connection, expire_on_commit=False) as session:
+        context = ToolContext(session=session, user_id=user_id)
+        return [execute_tool(name, args, user_id, context) for name, args in tool_calls]
+
+
+async def execute_tool_calls(
+    tool_calls: List[Tuple[str, Dict[str, Any]]],
+    user_id: int,
+    shared_session: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run one turn's tool calls [(name, args)]; results in call order
+    (deterministic `tool` messages). Both modes pass the pre-validated
+    user (see _run_tool_batch).
+
+    - shared_session (default: TOOL_SHARED_SESSION): one after another on
+      one session / connection: one checkout per turn, no overlap
+    - otherwise: parallel tool calls from one turn are independent by the
+      OpenAI contract, so lanes (see _tool_lane) run concurrently on the
+      bounded tool pool, each on its own session / connection; only
+      mutations of the same task are serialized. Faster, but k lanes
+      hold k connections at once.
+    """
+    loop = asyncio.get_running_loop()
+
+    if TOOL_SHARED_SESSION if shared_session is None else shared_session:
+        return await loop.run_in_executor(_tool_executor, _run_tool_batch, tool_calls, user_id)
+
+    lanes: Dict[Hashable, List[int]] = {}
+    for index, (name, args) in enumerate(tool_calls):
+        lanes.setdefault(_tool_lane(index, name, args), []).append(index)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+
+    async def run_lane(indexes: List[int]) -> None:
+        lane_calls = [tool_calls[index] for index in indexes]
+        lane_results = await loop.run_in_executor(_tool_executor, _run_tool_batch, lane_calls, user_id)
+        for index, result in zip(indexes, lane_results):
+            results[index] = result
+
+    await asyncio.gather(*(run_lane(indexes) for indexes in lanes.values()))
+    return results  # type: ignore[return-value]
 
 
 # ============================================================
-# AGENT EXECUTION
+# FAST PATH (rule-based, no LLM)
 # ============================================================
 
-def run_agent(
-    session: Session,
-    conversation_id: UUID,
+class FastPathStats:
+    """
+    Fast-path hits vs full agent runs (thread-safe, per process).
+    saved_ms_estimate = hits x (avg agent run - avg fast-path run).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fast_seconds_total = 0.0
+        self.agent_runs = 0
+        self.agent_seconds_total = 0.0
+
+    def record_fast(self, seconds: float) -> None:
+        with self._lock:
+            self.hits += 1
+            self.fast_seconds_total += seconds
+
+    def record_agent(self, seconds: float) -> None:
+        with self._lock:
+            self.agent_runs += 1
+            self.agent_seconds_total += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            fast_avg = (self.fast_seconds_total / self.hits) if self.hits else 0.0
+            agent_avg = (self.agent_seconds_total / self.agent_runs) if self.agent_runs else 0.0
+            return {
+                "enabled": CHAT_FAST_PATH,
+                "hits": self.hits,
+                "agent_runs": self.agent_runs,
+                "fast_ms_avg": fast_avg * 1000,
+                "agent_ms_avg": agent_avg * 1000,
+                "saved_ms_estimate": (self.hits * max(agent_avg - fast_avg, 0.0) * 1000) if self.agent_runs else 0.0,
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+async def run_fast_path(
+    user_id: int,
+    user_message: str,
+    preferred_language: Optional[str] = None,
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Answer a simple command without the LLM (CHAT_FAST_PATH only).
+
+    Returns:
+        (templated reply, tool call logs) like run_agent, or None when
+        disabled or the message is not a high-confidence simple command
+    """
+    if not CHAT_FAST_PATH:
+        return None
+
+    command = match_command(user_message)
+    if command is None:
+        return None
+
+    start = time.perf_counter()
+    tool_name, tool_args = command
+    tool_result = (await execute_tool_calls([command], user_id))[0]
+    reply = render_reply(tool_name, tool_args, tool_result, resolve_language(preferred_language, user_message))
+    fast_path_stats.record_fast(time.perf_counter() - start)
+
+    return reply, [{"tool": tool_name, "args": tool_args, "result": tool_result}]
+
+
+async def run_agent(
+    history: List[Dict[str, str]],
     user_id: int,
     user_message: str,
     preferred_language: Optional[str] = None,
 ) -> Tuple[str, List[Dict[str, Any]]]:
     """
+    history:
+      Prior turns from load_conversation_history (loaded by the caller on
+      its async session; this function does no request-session DB I/O).
     preferred_language:
       Optional "en" | "ur" (safe additive). If missing, fallback uses skill heuristic.
     """
-    history = load_conversation_history(session, conversation_id, user_id)
+    fast = await run_fast_path(user_id, user_message, preferred_language)
+    if fast is not None:
+        return fast
 
-    system_prompt = build_system_prompt(preferred_language, user_message)
+    cache_key = await chat_cache.cache_key(user_id, user_message, preferred_language)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    messages = [
-        {"role": "system", "content": system_prompt},
-        *history,
-        {"role": "user", "content": user_message},
-    ]
+    start = time.perf_counter()
+    result = await _run_llm_agent(history, user_id, user_message, preferred_language)
+    fast_path_stats.record_agent(time.perf_counter() - start)
+
+    chat_cache.put(cache_key, *result)
+    return result
+
+
+async def _run_llm_agent(
+    history: List[Dict[str, str]],
+    user_id: int,
+    user_message: str,
+    preferred_language: Optional[str],
+) -> Tuple[str, List[Dict[str, Any]]]:
+    messages = _build_messages(history, user_message, preferred_language)
 
     tools = get_tool_definitions()
     tool_call_logs: List[Dict[str, Any]] = []
 
-    max_iterations = 5
-
-    for _ in range(max_iterations):
-        response = openai_client.chat.completions.create(
+    for _ in range(MAX_ITERATIONS):
+        response = await openai_client.chat.completions.create(
             model=AI_MODEL,
             messages=messages,
             tools=tools,
             tool_choice="auto",
         )
+        prompt_usage.record(response.usage)
 
         assistant_message = response.choices[0].message
 
         if not assistant_message.tool_calls:
             return (assistant_message.content or ""), tool_call_logs
 
-        messages.append(
-            {
-                "role": "assistant",
-                "content": assistant_message.content,
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {"name": tc.function.name, "arguments": tc.function.arguments},
-                    }
-                    for tc in assistant_message.tool_calls
-                ],
-            }
+        tool_calls = [
+            {"id": tc.id, "name": tc.function.name, "arguments": tc.function.arguments}
+            for tc in assistant_message.tool_calls
+        ]
+        messages.append(_assistant_tool_call_message(assistant_message.content, tool_calls))
+
+        parsed = [(tc["name"], json.loads(tc["arguments"])) for tc in tool_calls]
+        tool_results = await execute_tool_calls(parsed, user_id)
+
+        for tool_call, (tool_name, tool_args), tool_result in zip(tool_calls, parsed, tool_results):
+            tool_call_logs.append({"tool": tool_name, "args": tool_args, "result": tool_result})
+            messages.append(_tool_result_message(tool_call["id"], tool_result))
+
+    return TOO_MANY_TOOL_CALLS_MESSAGE, tool_call_logs
+
+
+async def stream_agent(
+    history: List[Dict[str, str]],
+    user_id: int,
+    user_message: str,
+    preferred_language: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of run_agent (same tools, same guardrails).
+
+    Yields events as they arrive:
+      {"type": "token", "content": str}                     assistant text delta
+      {"type": "tool_call", "tool": str, "args": dict}      before the turn's tools run
+      {"type": "tool_result", "tool": str, "result": dict}  after they ran (call order)
+      {"type": "done", "response": str, "tool_calls": [...]}  always last
+    """
+    answered = await run_fast_path(user_id, user_message, preferred_language)
+    cache_key = None
+    if answered is None:
+        cache_key = await chat_cache.cache_key(user_id, user_message, preferred_language)
+        answered = chat_cache.get(cache_key)
+
+    if answered is not None:
+        # Fast path / cache hit: replay as the usual events
+        reply, tool_call_logs = answered
+        for log in tool_call_logs:
+            yield {"type": "tool_call", "tool": log["tool"], "args": log["args"]}
+            yield {"type": "tool_result", "tool": log["tool"], "result": log["result"]}
+        yield {"type": "token", "content": reply}
+        yield {"type": "done", "response": reply, "tool_calls": tool_call_logs}
+        return
+
+    start = time.perf_counter()
+    messages = _build_messages(history, user_message, preferred_language)
+
+    tools = get_tool_definitions()
+    tool_call_logs: List[Dict[str, Any]] = []
+
+    for _ in range(MAX_ITERATIONS):
+        stream = await openai_client.chat.completions.create(
+            model=AI_MODEL,
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+            stream=True,
+            stream_options={"include_usage": True},  # final chunk carries usage
         )
 
-        for tool_call in assistant_message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
+        content_parts: List[str] = []
+        partial_calls: Dict[int, Dict[str, Any]] = {}  # index -> {"id", "name", "arguments"}
 
-            tool_result = execute_tool(tool_name, tool_args, user_id)
+        # async with: the HTTP stream is closed if the consumer is cancelled
+        async with stream:
+            async for chunk in stream:
+                prompt_usage.record(chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
 
-            tool_call_logs.append({"tool": tool_name, "args": tool_args, "result": tool_result})
+                if delta.content:
+                    content_parts.append(delta.content)
+                    yield {"type": "token", "content": delta.content}
 
-            messages.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": json.dumps(tool_result),
-                }
-            )
+                for tc in delta.tool_calls or []:
+                    call = partial_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                    if tc.id:
+                        call["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        call["name"] += tc.function.name
+                    if tc.function and tc.function.arguments:
+                        call["arguments"] += tc.function.arguments
 
-    return (
-        "I apologize, but I encountered too many tool calls. Please try rephrasing your request.",
-        tool_call_logs,
-    )
+        content = "".join(content_parts)
+
+        if not partial_calls:
+            fast_path_stats.record_agent(time.perf_counter() - start)
+            chat_cache.put(cache_key, content, tool_call_logs)
+            yield {"type": "done", "response": content, "tool_calls": tool_call_logs}
+            return
+
+        tool_calls = [partial_calls[index] for index in sorted(partial_calls)]
+        messages.append(_assistant_tool_call_message(content or None, tool_calls))
+
+        parsed = [(tc["name"], json.loads(tc["arguments"] or "{}")) for tc in tool_calls]
+        for tool_name, tool_args in parsed:
+            yield {"type": "tool_call", "tool": tool_name, "args": tool_args}
+
+        tool_results = await execute_tool_calls(parsed, user_id)
+
+        for tool_call, (tool_name, tool_args), tool_result in zip(tool_calls, parsed, tool_results):
+            yield {"type": "tool_result", "tool": tool_name, "result": tool_result}
+
+            tool_call_logs.append({"tool": tool_name, "args": tool_args, "result": tool_result})
+            messages.append(_tool_result_message(tool_call["id"], tool_result))
+
+    fast_path_stats.record_agent(time.perf_counter() - start)
+    yield {"type": "done", "response": TOO_MANY_TOOL_CALLS_MESSAGE, "tool_calls": tool_call_logs}
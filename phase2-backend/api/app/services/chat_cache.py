@@ -0,0 +1,109 @@
+# app/services/chat_cache.py
+
+"""
+Response cache for read-only chat turns (entries per process, versions shared).
+
+- Only "list"-intent messages answered with read-only tool calls are
+  cached (answers grounded in the user's current tasks, not in history)
+- Key: (user_id, task version, language, canonical message)
+  - canonical message: the fast-path command when it parses
+    ("list my pending tasks" == "show pending tasks" -> list_tasks:pending),
+    else the normalized text (case, whitespace, trailing punctuation)
+  - task version: read from the DB (app/task_versions.py) when the key
+    is built; every task change bumps it in its own transaction, in any
+    worker, so a stale answer is never looked up again
+- Bounded LRU + TTL (app/cache.TTLCache), hit/miss/eviction counters
+"""
+
+import os
+import re
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..cache import TTLCache
+from ..database import async_engine
+from ..task_versions import task_version
+from .skills.fast_path_skill import match_command
+from .skills.language_router_skill import resolve_language
+from .skills.task_intent_skill import detect_intent
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "5000"))
+CHAT_CACHE_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL_SECONDS", "600"))
+
+if CHAT_CACHE_MAX_ENTRIES <= 0:
+    raise RuntimeError("CHAT_CACHE_MAX_ENTRIES must be > 0")
+
+if CHAT_CACHE_TTL_SECONDS <= 0:
+    raise RuntimeError("CHAT_CACHE_TTL_SECONDS must be > 0")
+
+READ_ONLY_TOOLS = {"list_tasks"}
+
+CachedTurn = Tuple[str, List[Dict[str, Any]]]  # (response, tool call logs)
+
+response_cache: TTLCache[Hashable, CachedTurn] = TTLCache(CHAT_CACHE_MAX_ENTRIES, CHAT_CACHE_TTL_SECONDS)
+
+
+# ============================================================
+# KEYS
+# ============================================================
+
+def _normalize(message: str) -> str:
+    return re.sub(r"\s+", " ", (message or "").strip().lower()).rstrip(".!?۔؟ ")
+
+
+async def cache_key(user_id: int, user_message: str, preferred_language: Optional[str]) -> Optional[Hashable]:
+    """
+    Cache key for a turn, or None if the message is not cacheable.
+    Read the key BEFORE running the agent (the version it carries must
+    not be newer than the data the answer is built from).
+    Costs one primary-key SELECT for cacheable messages only, on a
+    connection of its own: callers must not hold a pooled connection while
+    awaiting this (the chat routes end their read transaction before the
+    agent runs), or a small pool can deadlock on the second checkout.
+    """
+    if detect_intent(user_message) != "list":
+        return None
+
+    command = match_command(user_message)
+    if command is not None and command[0] == "list_tasks":
+        canonical = f"list_tasks:{command[1]['status']}"
+    else:
+        canonical = _normalize(user_message)
+
+    async with async_engine.connect() as connection:
+        version = await task_version(connection, user_id)
+
+    return (
+        user_id,
+        version,
+        resolve_language(preferred_language, user_message),
+        canonical,
+    )
+
+
+def is_cacheable(tool_call_logs: List[Dict[str, Any]]) -> bool:
+    """
+    Grounded in current data (at least one tool call) and read-only.
+    """
+    return bool(tool_call_logs) and all(
+        log["tool"] in READ_ONLY_TOOLS and log["result"].get("ok") for log in tool_call_logs
+    )
+
+
+def get(key: Optional[Hashable]) -> Optional[CachedTurn]:
+    if key is None:
+        return None
+    return response_cache.get(key)
+
+
+def put(key: Optional[Hashable], response: str, tool_call_logs: List[Dict[str, Any]]) -> None:
+    if key is not None and is_cacheable(tool_call_logs):
+        response_cache.set(key, (response, tool_call_logs))
+
+
+def cache_stats() -> Dict[str, Any]:
+    return response_cache.stats()
@@ -0,0 +1,267 @@
+# app/services/chat_context.py
+
+"""
+Token-budgeted context window for the chat agent.
+
+- History sent to the model = rolling summary (if any) + the newest
+  messages that fit HISTORY_TOKEN_BUDGET
+- When unsummarized messages overflow the budget, the oldest ones are
+  folded into a per-conversation summary (ConversationSummary, stored
+  with the turn)
+  until the rest fit HISTORY_KEEP_RATIO of the budget, so folding happens
+  once every few turns, not on every request
+- Messages past the max_messages row cap are folded too (never skipped);
+  the kept window is then trimmed to HISTORY_KEEP_RATIO of the cap
+- At most max_messages are folded per turn (one bounded summary prompt);
+  a longer backlog is folded oldest first over the next turns
+- Folding is incremental: old summary + newly evicted messages only
+- Token counts use tiktoken when installed, else a ~4 chars/token estimate
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from . import chat_repo
+from ..models import Message
+
+try:  # optional dependency
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on environment
+    tiktoken = None
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "3000"))
+HISTORY_KEEP_RATIO = float(os.getenv("HISTORY_KEEP_RATIO", "0.5"))
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "300"))
+
+if HISTORY_TOKEN_BUDGET <= 0:
+    raise RuntimeError("HISTORY_TOKEN_BUDGET must be > 0")
+
+if not 0 < HISTORY_KEEP_RATIO <= 1:
+    raise RuntimeError("HISTORY_KEEP_RATIO must be in (0, 1]")
+
+# Per-message framing overhead in the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Local fallback summary (LLM unavailable): keep this many trailing chars
+FALLBACK_SUMMARY_MAX_CHARS = 2000
+
+SUMMARY_PROMPT = """You maintain a running summary of a task-management chat.
+Merge the new messages into the current summary. Keep what later turns need:
+task titles and ids mentioned, what was created/updated/completed/deleted,
+user preferences, and any pending question or confirmation.
+At most 150 words. Reply with the summary only."""
+
+
+# ============================================================
+# TOKEN COUNTING
+# ============================================================
+
+_encoding: Any = None
+_encoding_loaded = False
+
+
+def _get_encoding() -> Any:
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:  # encoding files unavailable (offline)
+                _encoding = None
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Tokens in `text` (tiktoken o200k_base, or ~4 chars/token estimate).
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def message_tokens(content: str) -> int:
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def summary_message(summary: str) -> Dict[str, str]:
+    return {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+
+
+# ============================================================
+# WINDOW SELECTION (pure)
+# ============================================================
+
+def split_for_budget(
+    messages: List[Message],
+    budget: int,
+    keep_ratio: float,
+) -> Tuple[List[Message], List[Message]]:
+    """
+    Split oldest-first `messages` into (to_fold, to_keep).
+
+    - Everything fits `budget`: nothing to fold
+    - Otherwise keep the newest messages that fit budget * keep_ratio
+      (at least the newest one) and fold the rest
+    """
+    total = sum(message_tokens(m.content) for m in messages)
+    if total <= budget:
+        return [], list(messages)
+
+    target = budget * keep_ratio
+    kept_tokens = 0
+    cut = len(messages)
+    while cut > 0:
+        cost = message_tokens(messages[cut - 1].content)
+        if cut < len(messages) and kept_tokens + cost > target:
+            break
+        kept_tokens += cost
+        cut -= 1
+
+    return list(messages[:cut]), list(messages[cut:])
+
+
+# ============================================================
+# SUMMARIZATION
+# ============================================================
+
+def _transcript(messages: List[Message]) -> str:
+    return "\n".join(f"{m.role}: {m.content}" for m in messages)
+
+
+def _fallback_summary(previous: Optional[str], messages: List[Message]) -> str:
+    """
+    Local compaction when the LLM call fails: clipped transcript lines.
+    """
+    lines = [previous] if previous else []
+    lines.extend(f"{m.role}: {m.content[:200]}" for m in messages)
+    return "\n".join(lines)[-FALLBACK_SUMMARY_MAX_CHARS:]
+
+
+async def summarize(
+    client: Any,
+    model: str,
+    previous: Optional[str],
+    messages: List[Message],
+) -> str:
+    """
+    Fold `messages` into `previous` summary with one LLM call
+    (falls back to local compaction on any error).
+    """
+    try:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Current summary:\n{previous or '(none)'}\n\nNew messages:\n{_transcript(messages)}",
+                },
+            ],
+            max_tokens=SUMMARY_MAX_TOKENS,
+        )
+        text = (response.choices[0].message.content or "").strip()
+        if text:
+            return text
+    except Exception:
+        pass
+    return _fallback_summary(previous, messages)
+
+
+# ============================================================
+# CONTEXT WINDOW (DB + summary)
+# ============================================================
+
+async def build_context_window(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    max_messages: int,
+    client: Any,
+    model: str,
+    before: Optional[datetime] = None,
+) -> Tuple[List[Dict[str, str]], Optional[chat_repo.PendingSummary]]:
+    """
+    History for the next model call, within HISTORY_TOKEN_BUDGET.
+
+    Reads the stored summary (if any) and up to `max_messages` newest
+    messages after it (and before `before`, e.g. the current turn's user
+    message). If those overflow the budget, the oldest are folded into the
+    summary. If more than `max_messages` unsummarized messages exist, the
+    ones older than the window are folded as well, oldest first and at most
+    `max_messages` per call, so covered_until never skips a message. Until a
+    long backlog is caught up, its unfolded rest is left out of the window.
+
+    Nothing is written here: a fold is returned as a PendingSummary for
+    chat_repo.finish_turn to store with the assistant message. The read
+    transaction is ended before the summary LLM call, so no pooled
+    connection is held while it runs.
+
+    Returns:
+        (history messages, summary update or None)
+    """
+    summary = await chat_repo.get_conversation_summary(session, conversation_id, user_id)
+    covered_until = summary.covered_until if summary is not None else None
+
+    messages = await chat_repo.list_recent_messages_for_conversation(
+        session=session,
+        conversation_id=conversation_id,
+        user_id=user_id,
+        limit=max_messages,
+        after=covered_until,
+        before=before,
+    )
+
+    summary_text = summary.content if summary is not None else None
+    budget = HISTORY_TOKEN_BUDGET - (message_tokens(summary_text) if summary_text else 0)
+
+    to_fold, to_keep = split_for_budget(messages, max(budget, 0), HISTORY_KEEP_RATIO)
+
+    # Row cap reached: fold the rows it cut off too
+    overflow: List[Message] = []
+    if messages and len(messages) >= max_messages:
+        overflow = await chat_repo.list_messages_between(
+            session=session,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            after=covered_until,
+            before=messages[0].created_at,
+            limit=max_messages,
+        )
+    if overflow:
+        keep = max(1, int(max_messages * HISTORY_KEEP_RATIO))
+        if len(to_keep) > keep:
+            to_fold, to_keep = to_fold + to_keep[:-keep], to_keep[-keep:]
+        # Oldest first, one bounded chunk per turn; the rest waits
+        to_fold = (overflow + to_fold)[:max_messages]
+
+    # Reads done: give the connection back (ORM rows stay loaded,
+    # expire_on_commit=False)
+    await session.commit()
+
+    pending: Optional[chat_repo.PendingSummary] = None
+    if to_fold:
+        summary_text = await summarize(client, model, summary_text, to_fold)
+        pending = chat_repo.PendingSummary(
+            content=summary_text,
+            covered_until=to_fold[-1].created_at,
+            create=summary is None,
+        )
+
+    window = [{"role": m.role, "content": m.content} for m in to_keep]
+    if summary_text:
+        window.insert(0, summary_message(summary_text))
+    return window, pending
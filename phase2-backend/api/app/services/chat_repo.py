@@ -1,46 +1,31 @@
 # app/services/chat_repo.py
 
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..models import Conversation, Message
+from ..models import Conversation, ConversationSummary, Message
 
 
-# ============================================================
-# CONVERSATION CRUD
-# ============================================================
-
-def create_conversation(
-    session: Session,
-    user_id: int,
-    title: Optional[str] = None,
-) -> Conversation:
+class PendingSummary(NamedTuple):
     """
-    Create a new conversation for the given user.
-
-    Args:
-        session: Database session
-        user_id: Owner user ID
-        title: Optional conversation title
-
-    Returns:
-        Created Conversation instance
+    Summary update computed while loading history, stored with the turn.
     """
-    conversation = Conversation(
-        user_id=user_id,
-        title=title,
-    )
-    session.add(conversation)
-    session.commit()
-    session.refresh(conversation)
-    return conversation
+    content: str
+    covered_until: datetime  # created_at of the newest message folded into it
+    create: bool             # no summary row yet (insert instead of update)
 
 
-def get_conversation_for_user(
-    session: Session,
+# ============================================================
+# CONVERSATION CRUD
+# ============================================================
+
+async def get_conversation_for_user(
+    session: AsyncSession,
     conversation_id: UUID,
     user_id: int,
 ) -> Optional[Conversation]:
@@ -60,35 +45,36 @@ def get_conversation_for_user(
         .where(Conversation.id == conversation_id)
         .where(Conversation.user_id == user_id)  # Owner-only enforcement
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def update_conversation_timestamp(
-    session: Session,
+async def _touch_conversation(
+    session: AsyncSession,
     conversation_id: UUID,
     user_id: int,
-) -> None:
+) -> bool:
     """
-    Update the updated_at timestamp for a conversation.
+    Bump updated_at with one owner-scoped UPDATE (no SELECT, no commit).
+    The matched row count doubles as the ownership check.
 
-    Args:
-        session: Database session
-        conversation_id: Conversation UUID
-        user_id: Owner user ID (for isolation)
+    Returns:
+        True if the conversation exists and is owned by user, else False
     """
-    conversation = get_conversation_for_user(session, conversation_id, user_id)
-    if conversation:
-        conversation.updated_at = datetime.now(timezone.utc)
-        session.add(conversation)
-        session.commit()
+    result = await session.exec(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .where(Conversation.user_id == user_id)  # Owner-only enforcement
+        .values(updated_at=datetime.now(timezone.utc))
+    )
+    return result.rowcount == 1
 
 
 # ============================================================
 # MESSAGE CRUD
 # ============================================================
 
-def list_messages_for_conversation(
-    session: Session,
+async def list_messages_for_conversation(
+    session: AsyncSession,
     conversation_id: UUID,
     user_id: int,
 ) -> List[Message]:
@@ -105,7 +91,7 @@ def list_messages_for_conversation(
         List of Message instances ordered by created_at
     """
     # First verify the conversation exists and belongs to user
-    conversation = get_conversation_for_user(session, conversation_id, user_id)
+    conversation = await get_conversation_for_user(session, conversation_id, user_id)
     if not conversation:
         return []
 
@@ -115,45 +101,234 @@ def list_messages_for_conversation(
         .where(Message.user_id == user_id)  # Owner-only enforcement
         .order_by(Message.created_at.asc())
     )
-    return list(session.exec(statement).all())
+    return list((await session.exec(statement)).all())
+
+
+async def list_recent_messages_for_conversation(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    limit: int,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+) -> List[Message]:
+    """
+    Last `limit` messages of a conversation, enforcing owner-only access.
+    Only those rows are read (ORDER BY created_at DESC LIMIT n on the
+    (conversation_id, created_at) index); returned oldest first.
+
+    Args:
+        session: Database session
+        conversation_id: Conversation UUID
+        user_id: Owner user ID (for isolation)
+        limit: Maximum number of messages
+        after: Only messages created strictly after this time (optional)
+        before: Only messages created strictly before this time (optional)
+
+    Returns:
+        Up to `limit` Message instances ordered by created_at (oldest first);
+        empty if the conversation does not exist or is not owned by user
+    """
+    if limit <= 0:
+        return []
+
+    statement = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .where(Message.user_id == user_id)  # Owner-only enforcement
+    )
+    if after is not None:
+        statement = statement.where(Message.created_at > after)
+    if before is not None:
+        statement = statement.where(Message.created_at < before)
+    statement = statement.order_by(Message.created_at.desc()).limit(limit)
+    messages = list((await session.exec(statement)).all())
+    messages.reverse()
+    return messages
+
+
+async def list_messages_between(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    after: Optional[datetime],
+    before: datetime,
+    limit: int,
+) -> List[Message]:
+    """
+    Oldest `limit` messages created in (after, before), enforcing owner-only
+    access. Reads the rows that precede a list_recent_messages_for_conversation
+    window, a bounded chunk at a time.
+
+    Args:
+        session: Database session
+        conversation_id: Conversation UUID
+        user_id: Owner user ID (for isolation)
+        after: Only messages created strictly after this time (None = from the start)
+        before: Only messages created strictly before this time
+        limit: Maximum number of messages
+
+    Returns:
+        Up to `limit` Message instances ordered by created_at (oldest first)
+    """
+    if limit <= 0:
+        return []
+
+    statement = (
+        select(Message)
+        .where(Message.conversation_id == conversation_id)
+        .where(Message.user_id == user_id)  # Owner-only enforcement
+        .where(Message.created_at < before)
+    )
+    if after is not None:
+        statement = statement.where(Message.created_at > after)
+    statement = statement.order_by(Message.created_at.asc()).limit(limit)
+    return list((await session.exec(statement)).all())
 
 
-def add_message(
-    session: Session,
+
+async def begin_turn(
+    session: AsyncSession,
     conversation_id: UUID,
     user_id: int,
-    role: str,
-    content: str,
+    user_content: str,
+    created_at: datetime,
+    create: bool = False,
 ) -> Optional[Message]:
     """
-    Add a message to a conversation, enforcing owner-only access.
+    Store the user side of a chat turn before the agent runs (one commit):
+    conversation insert or owner-scoped updated_at bump, then the user
+    message. The message survives a failed, cancelled or crashed turn.
 
     Args:
         session: Database session
         conversation_id: Conversation UUID
         user_id: Owner user ID (for isolation)
-        role: Message role ("user" or "assistant")
-        content: Message content text
+        user_content: User message text
+        created_at: When the user message was received
+        create: Insert a new conversation with this ID (first turn)
 
     Returns:
-        Created Message instance if successful, else None
+        Stored user Message, or None if the conversation does not exist
+        or is not owned by user
     """
-    # Verify the conversation exists and belongs to user
-    conversation = get_conversation_for_user(session, conversation_id, user_id)
-    if not conversation:
+    if create:
+        session.add(Conversation(id=conversation_id, user_id=user_id))
+    elif not await _touch_conversation(session, conversation_id, user_id):
         return None
 
     message = Message(
         conversation_id=conversation_id,
         user_id=user_id,
-        role=role,
-        content=content,
+        role="user",
+        content=user_content,
+        created_at=created_at,
     )
     session.add(message)
-    session.commit()
-    session.refresh(message)
+    await session.commit()
+    return message
+
 
-    # Update conversation timestamp
-    update_conversation_timestamp(session, conversation_id, user_id)
+async def finish_turn(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    assistant_content: str,
+    summary: Optional[PendingSummary] = None,
+) -> Optional[Message]:
+    """
+    Store the rest of a chat turn as a single unit of work (one commit):
+    owner-scoped updated_at bump, the rolling summary folded while loading
+    history (if any), and the assistant message.
 
+    Args:
+        session: Database session
+        conversation_id: Conversation UUID
+        user_id: Owner user ID (for isolation)
+        assistant_content: Assistant response text
+        summary: Summary update from chat_context.build_context_window
+
+    Returns:
+        Stored assistant Message, or None if the conversation does not
+        exist or is not owned by user
+    """
+    if not await _touch_conversation(session, conversation_id, user_id):
+        return None
+
+    if summary is not None:
+        await save_conversation_summary(session, conversation_id, user_id, summary)
+
+    message = Message(
+        conversation_id=conversation_id,
+        user_id=user_id,
+        role="assistant",
+        content=assistant_content,
+    )
+    session.add(message)
+    await session.commit()
     return message
+
+
+# ============================================================
+# CONVERSATION SUMMARY
+# ============================================================
+
+async def get_conversation_summary(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+) -> Optional[ConversationSummary]:
+    """
+    Get the rolling summary of a conversation, enforcing owner-only access.
+
+    Args:
+        session: Database session
+        conversation_id: Conversation UUID
+        user_id: Owner user ID (for isolation)
+
+    Returns:
+        ConversationSummary instance if one exists, else None
+    """
+    statement = (
+        select(ConversationSummary)
+        .where(ConversationSummary.conversation_id == conversation_id)
+        .where(ConversationSummary.user_id == user_id)  # Owner-only enforcement
+    )
+    return (await session.exec(statement)).first()
+
+
+async def save_conversation_summary(
+    session: AsyncSession,
+    conversation_id: UUID,
+    user_id: int,
+    summary: PendingSummary,
+) -> None:
+    """
+    Insert or update the rolling summary of a conversation (no commit;
+    finish_turn commits it with the assistant message).
+
+    Args:
+        session: Database session
+        conversation_id: Conversation UUID
+        user_id: Owner user ID (for isolation)
+        summary: New summary text and coverage
+    """
+    now = datetime.now(timezone.utc)
+    if summary.create:
+        session.add(
+            ConversationSummary(
+                conversation_id=conversation_id,
+                user_id=user_id,
+                content=summary.content,
+                covered_until=summary.covered_until,
+                updated_at=now,
+            )
+        )
+        return
+
+    await session.exec(
+        update(ConversationSummary)
+        .where(ConversationSummary.conversation_id == conversation_id)
+        .where(ConversationSummary.user_id == user_id)  # Owner-only enforcement
+        .values(content=summary.content, covered_until=summary.covered_until, updated_at=now)
+    )
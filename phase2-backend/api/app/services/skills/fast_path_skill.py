@@ -0,0 +1,173 @@
+"""
+fast_path_skill.py
+
+Reusable Intelligence Skill:
+Recognise simple, high-confidence task commands and template their replies,
+so the agent can run them without an LLM round-trip.
+
+Only non-destructive commands are matched:
+- add:      "add buy milk", "create task: call mom", "کام شامل کرو: دودھ لانا"
+- list:     "show my tasks", "list pending tasks", "میرے کام دکھاؤ"
+- complete: "complete task 3", "mark task 3 as done"
+
+Anything else (delete, update, questions, compound requests, vague titles)
+returns None and goes to the LLM as before.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from .task_intent_skill import detect_intent
+
+
+MAX_TITLE_LENGTH = 80
+
+_STATUS_WORDS = {
+    "pending": "pending",
+    "open": "pending",
+    "incomplete": "pending",
+    "completed": "completed",
+    "complete": "completed",
+    "done": "completed",
+    "finished": "completed",
+}
+
+_STATUS = r"(?P<status>pending|open|incomplete|completed|complete|done|finished)"
+
+_LIST_PATTERNS = [
+    re.compile(
+        rf"^(?:please\s+)?(?:show|list|view|see|display)(?:\s+me)?(?:\s+all)?(?:\s+(?:my|the))?"
+        rf"(?:\s+{_STATUS})?\s+tasks?(?:\s+please)?$",
+        re.IGNORECASE,
+    ),
+    re.compile(rf"^(?:what\s+are\s+)?my(?:\s+{_STATUS})?\s+tasks\??$", re.IGNORECASE),
+    re.compile(r"^(?:میرے\s+)?(?:سب\s+|تمام\s+)?(?:کام|ٹاسک|ٹاسکس)\s+(?:دکھاؤ|دکھاو|دکھائیں)$"),
+    re.compile(r"^(?:میری\s+)?(?:کاموں\s+کی\s+)?(?:فہرست|لسٹ)\s+(?:دکھاؤ|دکھاو|دکھائیں)$"),
+]
+
+_ADD_PATTERNS = [
+    re.compile(
+        r"^(?:please\s+)?(?:add|create)(?:\s+a)?(?:\s+new)?(?:\s+task)?\s*(?::\s*|\s)(?P<title>.+?)"
+        r"(?:\s+to\s+my\s+(?:tasks|task\s+list|list))?$",
+        re.IGNORECASE,
+    ),
+    re.compile(r"^(?:نیا\s+)?کام\s+شامل\s+(?:کرو|کریں)\s*[:：]\s*(?P<title>.+)$"),
+]
+
+_COMPLETE_PATTERNS = [
+    re.compile(r"^(?:please\s+)?(?:complete|finish)\s+task\s+#?(?P<task_id>\d+)$", re.IGNORECASE),
+    re.compile(
+        r"^(?:please\s+)?(?:mark\s+)?task\s+#?(?P<task_id>\d+)(?:\s+as)?\s+(?:done|complete|completed|finished)$",
+        re.IGNORECASE,
+    ),
+]
+
+# Titles that point at context instead of naming a task (let the LLM ask)
+_VAGUE_TITLES = {"task", "a task", "new task", "a new task", "it", "this", "that", "them", "something", "one"}
+
+# Sequencing words / separators that join several commands in one message
+_COMPOUND = re.compile(r"\b(?:then|also|after\s+that|afterwards)\b|;|\bپھر\b", re.IGNORECASE)
+
+
+def _clean(message: str) -> str:
+    msg = re.sub(r"\s+", " ", (message or "").strip())
+    return msg.rstrip(".!۔ ")
+
+
+def _title_is_confident(title: str) -> bool:
+    if not title or len(title) > MAX_TITLE_LENGTH:
+        return False
+    if title.lower() in _VAGUE_TITLES or "?" in title:
+        return False
+    # "add eggs and add bread", "add milk then show my tasks":
+    # compound request, not a plain add
+    if _COMPOUND.search(title):
+        return False
+    return detect_intent(title) == "unknown"
+
+
+def match_command(message: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Map a message to a (tool_name, tool_args) call, or None if not
+    a simple, high-confidence, non-destructive command.
+    """
+    msg = _clean(message)
+    if not msg or "\n" in msg:
+        return None
+
+    for pattern in _LIST_PATTERNS:
+        m = pattern.match(msg)
+        if m:
+            status = (m.groupdict().get("status") or "").lower()
+            return "list_tasks", {"status": _STATUS_WORDS.get(status, "all")}
+
+    for pattern in _COMPLETE_PATTERNS:
+        m = pattern.match(msg)
+        if m:
+            return "complete_task", {"task_id": int(m.group("task_id"))}
+
+    for pattern in _ADD_PATTERNS:
+        m = pattern.match(msg)
+        if m:
+            title = m.group("title").strip().strip("\"'")
+            if _title_is_confident(title):
+                return "add_task", {"title": title}
+            return None
+
+    return None
+
+
+# ============================================================
+# Reply templates
+# ============================================================
+
+_TEMPLATES = {
+    "en": {
+        "added": 'Added "{title}" to your tasks (#{id}).',
+        "completed": 'Marked "{title}" (#{id}) as completed.',
+        "list_header": "Here are your {status}tasks:",
+        "list_empty": "You have no {status}tasks.",
+        "failed": "Sorry, I couldn't do that: {message}",
+        "status": {"all": "", "pending": "pending ", "completed": "completed "},
+        "done_mark": "[x]",
+        "open_mark": "[ ]",
+    },
+    "ur": {
+        "added": 'کام "{title}" شامل کر دیا گیا (#{id})۔',
+        "completed": 'کام "{title}" (#{id}) مکمل کر دیا گیا۔',
+        "list_header": "آپ کے {status}کام:",
+        "list_empty": "آپ کے پاس کوئی {status}کام نہیں ہے۔",
+        "failed": "معذرت، یہ نہیں ہو سکا: {message}",
+        "status": {"all": "", "pending": "زیر التواء ", "completed": "مکمل "},
+        "done_mark": "[x]",
+        "open_mark": "[ ]",
+    },
+}
+
+
+def render_reply(tool_name: str, tool_args: Dict[str, Any], tool_result: Dict[str, Any], lang: str) -> str:
+    """
+    Template the assistant reply for a fast-path tool result.
+    lang: "en" | "ur" (from resolve_language)
+    """
+    t = _TEMPLATES.get(lang, _TEMPLATES["en"])
+
+    if not tool_result.get("ok"):
+        return t["failed"].format(message=tool_result.get("message", ""))
+
+    data = tool_result.get("data")
+
+    if tool_name == "list_tasks":
+        status = t["status"].get(tool_args.get("status", "all"), "")
+        if not data:
+            return t["list_empty"].format(status=status)
+        lines = [t["list_header"].format(status=status)]
+        for task in data:
+            mark = t["done_mark"] if task["is_completed"] else t["open_mark"]
+            lines.append(f"{mark} #{task['id']} {task['title']}")
+        return "\n".join(lines)
+
+    key = "added" if tool_name == "add_task" else "completed"
+    return t[key].format(title=data["title"], id=data["id"])
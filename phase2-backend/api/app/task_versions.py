@@ -0,0 +1,79 @@
+# app/task_versions.py
+
+"""
+Per-user task version counters (TaskVersion table, shared by all workers).
+
+- Bumped inside every transaction that changes a user's tasks, so the new
+  version becomes visible exactly when the new rows do (and a rollback
+  undoes it)
+- Caches of task-derived data (chat response cache) read the version when
+  building their keys, so a bump by any worker makes every older entry
+  unreachable in every worker
+
+Bumping:
+- ORM: an after_flush Session hook upserts the version of every owner of
+  inserted / updated / deleted Task rows on the flush's connection.
+  Covers both sync sessions (MCP tools) and AsyncSession (routes).
+- Core-level UPDATE/DELETE on the task table bypass ORM events;
+  await bump_task_version() in the same transaction, before commit.
+"""
+
+from itertools import chain
+from typing import Iterable, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .models import Task, TaskVersion
+
+
+# INSERT ... ON CONFLICT DO UPDATE, per backend (same syntax for both)
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def _bump_statement(dialect: Dialect, user_ids: Iterable[int]):
+    insert = _UPSERT_INSERTS.get(dialect.name)
+    if insert is None:
+        raise RuntimeError(f"No task version upsert for database backend: {dialect.name}")
+    statement = insert(TaskVersion).values([{"user_id": user_id, "version": 1} for user_id in sorted(user_ids)])
+    return statement.on_conflict_do_update(
+        index_elements=[TaskVersion.user_id],
+        set_={"version": TaskVersion.version + 1},
+    )
+
+
+async def task_version(connection: AsyncConnection, user_id: int) -> int:
+    """
+    Current task version of a user (0 if the tasks never changed).
+    """
+    version = await connection.scalar(select(TaskVersion.version).where(TaskVersion.user_id == user_id))
+    return version or 0
+
+
+async def bump_task_version(session: AsyncSession, user_id: int) -> None:
+    """
+    Mark a user's tasks as changed (call inside the transaction, before commit).
+    """
+    await session.exec(_bump_statement(session.bind.dialect, [user_id]))
+
+
+# ============================================================
+# ORM hooks
+# ============================================================
+@event.listens_for(Session, "after_flush")
+def _bump_task_owners(session: Session, flush_context) -> None:
+    owners: Set[int] = {
+        obj.user_id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, Task) and obj.user_id is not None
+    }
+    if owners:
+        connection: Connection = session.connection()
+        connection.execute(_bump_statement(connection.dialect, owners))
@@ -0,0 +1,122 @@
+"""
+Benchmark: registration and login throughput under concurrency
+
+Purpose:
+- Register N fresh users, then log each of them in, with C requests in flight
+- Report req/s, latency percentiles and 503 (password pool full) counts
+- Probe GET /api/health during each phase: if bcrypt ran on the event
+  loop, health latency would climb with every in-flight hash
+
+Run (server must be up):
+    uvicorn app.main:app --port 8000 --workers 1
+    python benchmarks/bench_auth.py
+    python benchmarks/bench_auth.py --users 400 --concurrency 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct))
+    return sorted_values[index]
+
+
+async def _probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/health")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+
+
+async def _phase(
+    name: str,
+    client: httpx.AsyncClient,
+    calls: List[Callable[[], Awaitable[httpx.Response]]],
+    concurrency: int,
+) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def _one(call: Callable[[], Awaitable[httpx.Response]]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            r = await call()
+            latencies.append(time.perf_counter() - start)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    stop = asyncio.Event()
+    health: List[float] = []
+    probe = asyncio.create_task(_probe_health(client, stop, health))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[_one(call) for call in calls])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+
+    latencies.sort()
+    health.sort()
+    print(f"\n{name}: {len(calls):,} requests, concurrency {concurrency}")
+    print(f"  throughput      {len(calls) / elapsed:10,.1f} req/s")
+    print(f"  latency p50     {_percentile(latencies, 0.50) * 1000:10.1f} ms")
+    print(f"  latency p99     {_percentile(latencies, 0.99) * 1000:10.1f} ms")
+    print(f"  health p99      {_percentile(health, 0.99) * 1000:10.1f} ms  ({len(health)} probes)")
+    print(f"  status codes    {dict(sorted(statuses.items()))}")
+    return {"rps": len(calls) / elapsed, "ok": statuses.get(200, 0) + statuses.get(201, 0)}
+
+
+async def run(args: argparse.Namespace) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency + 5)
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(args.users)]
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        register = await _phase(
+            "register",
+            client,
+            [
+                (lambda e=email: client.post("/api/auth/register", json={"email": e, "password": args.password}))
+                for email in emails
+            ],
+            args.concurrency,
+        )
+        login = await _phase(
+            "login",
+            client,
+            [
+                (lambda e=email: client.post("/api/auth/login", data={"username": e, "password": args.password}))
+                for email in emails
+            ],
+            args.concurrency,
+        )
+
+    return 0 if register["ok"] and login["ok"] else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Nimbus auth throughput benchmark")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=200, help="users to register, then log in")
+    parser.add_argument("--concurrency", type=int, default=50, help="requests in flight")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (seconds)")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark: chat request build cost and cacheable prompt prefix (offline)
+
+Purpose:
+- Build the OpenAI request body (system prompt + history + tools) the way
+  run_agent does, for a mix of messages / intents / languages
+- Report per-request build + JSON serialization time and body size
+- Report prompt tokens and how many of them sit in a byte-identical
+  prefix shared by consecutive requests (what provider-side prompt
+  caching can reuse; OpenAI caches prefixes of 1024+ tokens)
+
+No server, database or API key needed.
+
+Run (from phase2-backend/api):
+    python benchmarks/bench_prompt.py
+    python benchmarks/bench_prompt.py --requests 20000 --history 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services import chat_agent  # noqa: E402
+from app.services.chat_context import count_tokens  # noqa: E402
+
+
+MESSAGES = [
+    ("en", "add buy milk"),
+    ("en", "show my tasks"),
+    ("en", "mark task 3 as done"),
+    ("en", "rename task 2 to call mom"),
+    ("en", "delete task 5"),
+    ("en", "hello there"),
+    ("ur", "میرے کام دکھاؤ"),
+    ("ur", "نیا کام شامل کرو دودھ لانا"),
+]
+
+
+def _history(turns: int) -> List[Dict[str, str]]:
+    history: List[Dict[str, str]] = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"earlier message {i}"})
+        history.append({"role": "assistant", "content": f"earlier reply {i}"})
+    return history
+
+
+def _body(history: List[Dict[str, str]], language: str, message: str) -> Dict[str, Any]:
+    # Key order = provider prompt order (tools are rendered ahead of messages)
+    return {
+        "model": chat_agent.AI_MODEL,
+        "tools": chat_agent.get_tool_definitions(),
+        "tool_choice": "auto",
+        "messages": chat_agent._build_messages(history, message, language),
+    }
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Nimbus chat prompt build benchmark")
+    parser.add_argument("--requests", type=int, default=10000, help="request bodies to build")
+    parser.add_argument("--history", type=int, default=10, help="prior turns per request")
+    args = parser.parse_args()
+
+    history = _history(args.history)
+
+    # Build + serialize cost
+    timings: List[float] = []
+    for i in range(args.requests):
+        language, message = MESSAGES[i % len(MESSAGES)]
+        start = time.perf_counter()
+        json.dumps(_body(history, language, message))
+        timings.append(time.perf_counter() - start)
+
+    # Cacheable prefix: consecutive requests, same conversation and language
+    prompt_tokens: List[int] = []
+    prefix_tokens: List[int] = []
+    sizes: List[int] = []
+    for language in ("en", "ur"):
+        bodies = [
+            json.dumps(_body(history, lang, message), ensure_ascii=False)
+            for lang, message in MESSAGES
+            if lang == language
+        ]
+        for previous, current in zip(bodies, bodies[1:]):
+            sizes.append(len(current.encode()))
+            prompt_tokens.append(count_tokens(current))
+            prefix_tokens.append(count_tokens(current[:_common_prefix(previous, current)]))
+
+    timings.sort()
+    print(f"\nchat request build: {args.requests:,} bodies, {args.history} prior turns")
+    print(f"  build+json p50    {statistics.median(timings) * 1e6:10.1f} us")
+    print(f"  build+json p99    {timings[int(len(timings) * 0.99)] * 1e6:10.1f} us")
+    print(f"  body size avg     {statistics.mean(sizes):10.0f} bytes")
+    print(f"  prompt tokens avg {statistics.mean(prompt_tokens):10.0f}")
+    print(f"  shared prefix avg {statistics.mean(prefix_tokens):10.0f} tokens "
+          f"({statistics.mean(prefix_tokens) / statistics.mean(prompt_tokens):.0%} of prompt)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
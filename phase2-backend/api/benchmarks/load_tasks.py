@@ -0,0 +1,123 @@
+"""
+Load test: authenticated task endpoints under high concurrency
+
+Purpose:
+- Open N concurrent client connections against a running API
+- Hammer GET /api/tasks (and optionally POST /api/tasks) for a fixed time
+- Report throughput (req/s), error count and latency percentiles
+
+Compare two builds by running the same command against each
+(e.g. sync routes vs async routes) and comparing req/s and p99.
+
+Run (server must be up, user must exist):
+    uvicorn app.main:app --port 8000 --workers 1
+    python benchmarks/load_tasks.py --email a@b.com --password secret
+    python benchmarks/load_tasks.py --concurrency 1000 --duration 30 --write-ratio 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    r = await client.post(
+        "/api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    deadline: float,
+    write_ratio: float,
+    latencies: List[float],
+    errors: List[int],
+    rng: random.Random,
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                r = await client.post("/api/tasks", json={"title": "load test"}, headers=headers)
+            else:
+                r = await client.get("/api/tasks", params={"limit": 20}, headers=headers)
+            if r.status_code >= 400:
+                errors.append(r.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - start)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct))
+    return sorted_values[index]
+
+
+async def run(args: argparse.Namespace) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        token = await _login(client, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        latencies: List[float] = []
+        errors: List[int] = []
+        start = time.perf_counter()
+        deadline = start + args.duration
+
+        await asyncio.gather(*[
+            _worker(client, headers, deadline, args.write_ratio, latencies, errors, random.Random(i))
+            for i in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"target:       {args.base_url}")
+    print(f"concurrency:  {args.concurrency}")
+    print(f"duration:     {elapsed:.1f}s")
+    print(f"requests:     {total:,}  (errors: {len(errors):,})")
+    if errors:
+        breakdown = ", ".join(f"{code or 'conn'}: {n}" for code, n in Counter(errors).most_common())
+        print(f"error codes:  {breakdown}")
+    print(f"throughput:   {total / elapsed:,.0f} req/s")
+    if total:
+        print(f"latency mean: {statistics.fmean(latencies) * 1000:8.1f} ms")
+        for label, pct in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            print(f"latency {label}:  {_percentile(latencies, pct) * 1000:8.1f} ms")
+
+    return 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Nimbus API load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=500, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds to run")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="fraction of requests that POST a task")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout (seconds)")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
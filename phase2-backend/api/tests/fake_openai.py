@@ -0,0 +1,164 @@
+# tests/fake_openai.py
+
+"""
+Local fake OpenAI server (real HTTP on 127.0.0.1, random port).
+
+Serves POST /v1/chat/completions from a queue of scripted turns:
+- {"content": "text"}                          plain assistant reply
+- {"tool_calls": [("add_task", {...}), ...]}   assistant asks for tools
+- optional "delay": seconds before responding (timeout tests)
+
+Supports both JSON and stream=True (SSE chunks, split to exercise
+delta reassembly). Received request bodies are kept in .requests.
+Every response reports the fixed USAGE (stream: when include_usage is set).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from openai import AsyncOpenAI
+
+
+USAGE = {
+    "prompt_tokens": 100,
+    "completion_tokens": 10,
+    "total_tokens": 110,
+    "prompt_tokens_details": {"cached_tokens": 64},
+}
+
+class FakeOpenAI:
+    def __init__(self) -> None:
+        self.turns: List[Dict[str, Any]] = []
+        self.requests: List[Dict[str, Any]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def client(self, timeout: float = 5.0) -> AsyncOpenAI:
+        return AsyncOpenAI(api_key="test", base_url=self.base_url, timeout=timeout, max_retries=0)
+
+    def start(self) -> "FakeOpenAI":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ------------------------------------------------------------
+    # Response bodies
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _tool_calls(turn: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": f"call_{i}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args)},
+            }
+            for i, (name, args) in enumerate(turn.get("tool_calls", []))
+        ]
+
+    def _completion(self, turn: Dict[str, Any]) -> Dict[str, Any]:
+        tool_calls = self._tool_calls(turn)
+        message: Dict[str, Any] = {"role": "assistant", "content": turn.get("content")}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "fake",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_calls else "stop",
+                }
+            ],
+            "usage": USAGE,
+        }
+
+    def _chunks(self, turn: Dict[str, Any], include_usage: bool = False) -> List[Dict[str, Any]]:
+        deltas: List[Dict[str, Any]] = []
+
+        content = turn.get("content") or ""
+        for i in range(0, len(content), 4):
+            deltas.append({"content": content[i:i + 4]})
+
+        for index, call in enumerate(self._tool_calls(turn)):
+            arguments = call["function"]["arguments"]
+            half = len(arguments) // 2
+            deltas.append({"tool_calls": [{
+                "index": index,
+                "id": call["id"],
+                "type": "function",
+                "function": {"name": call["function"]["name"], "arguments": arguments[:half]},
+            }]})
+            deltas.append({"tool_calls": [{"index": index, "function": {"arguments": arguments[half:]}}]})
+
+        chunks = [
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": "fake",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+            for delta in deltas
+        ]
+        if include_usage:
+            chunks.append({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": "fake",
+                "choices": [],
+                "usage": USAGE,
+            })
+        return chunks
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:  # keep pytest output clean
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                fake.requests.append(body)
+                turn = fake.turns.pop(0) if fake.turns else {"content": ""}
+
+                time.sleep(turn.get("delay", 0))
+
+                try:
+                    if body.get("stream"):
+                        self.send_response(200)
+                        self.send_header("Content-Type", "text/event-stream")
+                        self.end_headers()
+                        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+                        for chunk in fake._chunks(turn, include_usage):
+                            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                            self.wfile.flush()
+                        self.wfile.write(b"data: [DONE]\n\n")
+                    else:
+                        payload = json.dumps(fake._completion(turn)).encode()
+                        self.send_response(200)
+                        self.send_header("Content-Type", "application/json")
+                        self.send_header("Content-Length", str(len(payload)))
+                        self.end_headers()
+                        self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (timeout tests)
+
+        return Handler
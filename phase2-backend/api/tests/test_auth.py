@@ -44,3 +44,83 @@ def test_login_success_seeded_user_and_me():
         me_data = me.json()
         assert me_data.get("email") == email
         assert isinstance(me_data.get("id"), int)
+
+
+def test_me_uses_user_cache_and_invalidates_on_change():
+    """
+    Auth cache Gate:
+    - Repeated authenticated calls hit the token + user caches
+    - Updating the User row drops the cached record
+    """
+    from sqlmodel import Session, select
+
+    from app.auth_cache import user_cache
+    from app.database import engine
+    from app.models import User
+
+    email = os.getenv("TEST_USER_EMAIL")
+    password = os.getenv("TEST_USER_PASSWORD")
+
+    with TestClient(app) as client:
+        r = client.post(
+            "/api/auth/login",
+            data={"username": email, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        hits_before = user_cache.hits
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert user_cache.hits == hits_before + 1
+
+        with Session(engine) as session:
+            user = session.exec(select(User).where(User.email == email)).first()
+            user_id = user.id
+            assert user_cache.get(user_id) is not None
+            # any real column change fires the ORM after_update hook
+            user.created_at = user.created_at.replace(microsecond=(user.created_at.microsecond + 1) % 1000000)
+            session.add(user)
+            session.commit()
+
+        assert user_cache.get(user_id) is None
+
+        metrics = client.get("/api/metrics").json()
+        assert metrics["auth_cache"]["user_cache"]["hits"] >= 1
+
+
+def test_password_pool_full_returns_503(monkeypatch):
+    """
+    Password pool Gate:
+    - Full hashing queue rejects login/register with 503 + Retry-After
+    - Rejections are counted in /api/metrics
+    """
+    from app.auth import password_pool
+
+    email = os.getenv("TEST_USER_EMAIL")
+    password = os.getenv("TEST_USER_PASSWORD")
+
+    with TestClient(app) as client:
+        monkeypatch.setattr(password_pool, "max_pending", 0)
+
+        r = client.post(
+            "/api/auth/login",
+            data={"username": email, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert r.status_code == 503
+        assert r.headers.get("retry-after") == "1"
+
+        r = client.post("/api/auth/register", json={"email": "busy@example.com", "password": "secret123"})
+        assert r.status_code == 503
+
+        stats = client.get("/api/metrics").json()["password_pool"]
+        assert stats["rejected"] >= 2
+
+        monkeypatch.undo()
+        r = client.post(
+            "/api/auth/login",
+            data={"username": email, "password": password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert r.status_code == 200
@@ -0,0 +1,859 @@
+# tests/test_chat.py
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from .fake_openai import FakeOpenAI
+
+
+CHAT_BASE = "/api/chat"
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def _login_headers(client: TestClient) -> dict:
+    r = client.post(
+        "/api/auth/login",
+        data={"username": os.getenv("TEST_USER_EMAIL"), "password": os.getenv("TEST_USER_PASSWORD")},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200, f"Login failed: {r.status_code} {r.text}"
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def _parse_sse(text: str) -> list:
+    events = []
+    for frame in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """
+    Local fake OpenAI server wired into chat_agent.
+    """
+    from app.services import chat_agent
+
+    fake = FakeOpenAI().start()
+    monkeypatch.setattr(chat_agent, "openai_client", fake.client())
+    yield fake
+    fake.stop()
+
+
+def test_chat_runs_tools_and_persists(fake_openai):
+    """
+    Async agent Gate:
+    - Tool call round-trip against the fake OpenAI server
+    - Tool result is sent back as a `tool` message
+    - Both messages are persisted
+    """
+    fake_openai.turns = [
+        {"tool_calls": [("add_task", {"title": "Agent task"})]},
+        {"content": "Done, task added."},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        r = client.post(CHAT_BASE, json={"message": "add Agent task"}, headers=headers)
+        assert r.status_code == 200, r.text
+
+        data = r.json()
+        assert data["response"] == "Done, task added."
+        assert data["tool_calls"][0]["tool"] == "add_task"
+        assert data["tool_calls"][0]["result"]["ok"] is True
+
+        assert len(fake_openai.requests) == 2
+        assert fake_openai.requests[1]["messages"][-1]["role"] == "tool"
+
+        history = client.get(f"{CHAT_BASE}/history/{data['conversation_id']}", headers=headers).json()
+        assert [m["role"] for m in history["messages"]] == ["user", "assistant"]
+
+
+def test_chat_stream_tokens_tools_and_persistence(fake_openai):
+    """
+    Streaming Gate:
+    - SSE frames: conversation -> tool_call/tool_result -> tokens -> done
+    - Tool-call arguments are reassembled from deltas
+    - Full assistant message is persisted (visible in history)
+    """
+    fake_openai.turns = [
+        {"tool_calls": [("add_task", {"title": "Streamed task"})]},
+        {"content": "Added your task."},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        r = client.post(f"{CHAT_BASE}/stream", json={"message": "add Streamed task"}, headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.headers["content-type"].startswith("text/event-stream")
+
+        events = _parse_sse(r.text)
+        names = [name for name, _ in events]
+        assert names[:3] == ["conversation", "tool_call", "tool_result"]
+        assert set(names[3:-1]) == {"token"}
+        assert names[-1] == "done"
+
+        assert events[1][1] == {"tool": "add_task", "args": {"title": "Streamed task"}}
+        assert events[2][1]["result"]["ok"] is True
+        assert "".join(data["content"] for name, data in events if name == "token") == "Added your task."
+
+        done = events[-1][1]
+        assert done["response"] == "Added your task."
+        assert done["tool_calls"][0]["tool"] == "add_task"
+        assert all(body["stream"] is True for body in fake_openai.requests)
+
+        history = client.get(f"{CHAT_BASE}/history/{done['conversation_id']}", headers=headers)
+        assert history.status_code == 200
+        messages = history.json()["messages"]
+        assert [m["role"] for m in messages] == ["user", "assistant"]
+        assert messages[-1]["content"] == "Added your task."
+
+        titles = [t["title"] for t in client.get("/api/tasks", headers=headers).json()]
+        assert "Streamed task" in titles
+
+
+def test_chat_openai_timeout_returns_fallback(fake_openai, monkeypatch):
+    """
+    Timeout Gate:
+    - A slow OpenAI call is abandoned after the per-call timeout
+    - The user gets the graceful fallback instead of a hung request
+    """
+    from app.services import chat_agent
+
+    monkeypatch.setattr(chat_agent, "openai_client", fake_openai.client(timeout=0.3))
+    fake_openai.turns = [{"content": "too late", "delay": 2.0}]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        start = time.perf_counter()
+        r = client.post(CHAT_BASE, json={"message": "hello"}, headers=headers)
+        elapsed = time.perf_counter() - start
+
+    assert r.status_code == 200
+    assert r.json()["response"].startswith("I apologize, but I encountered an error")
+    assert elapsed < 2.0
+
+
+def test_cancel_on_disconnect_cancels_agent():
+    """
+    Disconnect Gate:
+    - Work is cancelled once the client is gone (499, nothing returned)
+    """
+    from app.routes import chat
+
+    class _GoneRequest:
+        async def is_disconnected(self) -> bool:
+            return True
+
+    cancelled = asyncio.Event()
+
+    async def slow_agent():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def scenario():
+        with pytest.raises(HTTPException) as exc:
+            await chat._cancel_on_disconnect(_GoneRequest(), slow_agent())
+        await asyncio.sleep(0)
+        return exc.value.status_code
+
+    assert asyncio.run(scenario()) == chat.CLIENT_CLOSED_REQUEST
+    assert cancelled.is_set()
+
+
+def test_chat_turn_is_two_transactions(fake_openai):
+    """
+    Unit-of-work Gate:
+    - A follow-up turn writes twice: user message (+ ownership, timestamp bump)
+      before the agent runs, assistant message (+ summary) after; the only
+      other commit ends the history read
+    - Messages are stored in order
+    """
+    from sqlalchemy import event
+
+    from app.database import async_engine
+
+    fake_openai.turns = [{"content": "first"}, {"content": "second"}]
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        r = client.post(CHAT_BASE, json={"message": "one"}, headers=headers)
+        assert r.status_code == 200, r.text
+        conversation_id = r.json()["conversation_id"]
+
+        event.listen(async_engine.sync_engine, "commit", on_commit)
+        try:
+            r = client.post(CHAT_BASE, json={"message": "two", "conversation_id": conversation_id}, headers=headers)
+        finally:
+            event.remove(async_engine.sync_engine, "commit", on_commit)
+        assert r.status_code == 200, r.text
+
+        history = client.get(f"{CHAT_BASE}/history/{conversation_id}", headers=headers).json()
+
+    assert len(commits) == 3
+    assert [m["content"] for m in history["messages"]] == ["one", "first", "two", "second"]
+
+
+def test_agent_runs_without_a_pooled_connection(fake_openai, monkeypatch):
+    """
+    Pool Gate:
+    - The request session holds no connection while a follow-up turn's agent runs
+    """
+    from app.database import async_engine
+    from app.services import chat_agent
+
+    fake_openai.turns = [{"content": "first"}, {"content": "second"}]
+    checked_out = []
+    run_agent = chat_agent.run_agent
+
+    async def recording_run_agent(**kwargs):
+        checked_out.append(async_engine.pool.checkedout())
+        return await run_agent(**kwargs)
+
+    monkeypatch.setattr(chat_agent, "run_agent", recording_run_agent)
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        r = client.post(CHAT_BASE, json={"message": "one"}, headers=headers)
+        assert r.status_code == 200, r.text
+        conversation_id = r.json()["conversation_id"]
+
+        r = client.post(CHAT_BASE, json={"message": "two", "conversation_id": conversation_id}, headers=headers)
+        assert r.status_code == 200, r.text
+
+    assert checked_out == [0, 0]
+
+
+def test_user_message_is_stored_before_the_agent_runs(fake_openai, monkeypatch):
+    """
+    Persistence Gate:
+    - A turn whose agent never answers (client gone: 499) keeps the user message
+    - The streamed conversation ID exists in the DB while the agent runs
+    """
+    from sqlmodel import select
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from app.database import async_engine
+    from app.models import Message
+    from app.services import chat_agent
+
+    fake_openai.turns = [{"content": "first"}]
+
+    async def gone_agent(**kwargs):
+        raise HTTPException(status_code=499, detail="Client closed request")
+
+    stored_during_stream = []
+
+    async def probing_stream_agent(**kwargs):
+        async with AsyncSession(async_engine) as probe:
+            rows = await probe.exec(
+                select(Message)
+                .where(Message.user_id == kwargs["user_id"])
+                .where(Message.content == kwargs["user_message"])
+            )
+            stored_during_stream.extend(str(m.conversation_id) for m in rows.all())
+        yield {"type": "done", "response": "streamed", "tool_calls": []}
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        r = client.post(CHAT_BASE, json={"message": "one"}, headers=headers)
+        assert r.status_code == 200, r.text
+        conversation_id = r.json()["conversation_id"]
+
+        monkeypatch.setattr(chat_agent, "run_agent", gone_agent)
+        r = client.post(CHAT_BASE, json={"message": "two", "conversation_id": conversation_id}, headers=headers)
+        assert r.status_code == 499
+
+        history = client.get(f"{CHAT_BASE}/history/{conversation_id}", headers=headers).json()
+        assert [m["content"] for m in history["messages"]] == ["one", "first", "two"]
+
+        monkeypatch.setattr(chat_agent, "stream_agent", probing_stream_agent)
+        message = f"three {time.time_ns()}"
+        r = client.post(f"{CHAT_BASE}/stream", json={"message": message}, headers=headers)
+        events = _parse_sse(r.text)
+
+    assert events[0][0] == "conversation"
+    assert stored_during_stream == [events[0][1]["conversation_id"]]
+
+
+def test_chat_stream_ends_with_done_when_the_turn_cannot_be_stored(fake_openai, monkeypatch):
+    """
+    Streaming Gate:
+    - A failing finish step still sends `error`, then `done` as the last frame
+    """
+    from app.services import chat_repo
+
+    fake_openai.turns = [{"content": "first"}]
+
+    async def broken_finish_turn(**kwargs):
+        raise RuntimeError("pool exhausted")
+
+    monkeypatch.setattr(chat_repo, "finish_turn", broken_finish_turn)
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        r = client.post(f"{CHAT_BASE}/stream", json={"message": "one"}, headers=headers)
+
+    assert r.status_code == 200, r.text
+    events = _parse_sse(r.text)
+    assert [name for name, _ in events][-2:] == ["error", "done"]
+    assert events[-2][1] == {"detail": "Failed to store chat turn"}
+    assert events[-1][1]["response"] == "first"
+
+
+def test_chat_stream_unknown_conversation_404():
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        r = client.post(
+            f"{CHAT_BASE}/stream",
+            json={"message": "hi", "conversation_id": "00000000-0000-0000-0000-000000000000"},
+            headers=headers,
+        )
+        assert r.status_code == 404
+
+
+def test_tool_calls_run_concurrently_but_serialize_same_task(monkeypatch):
+    """
+    Parallel tools Gate:
+    - Independent calls overlap; mutations of the same task_id do not
+    - Results come back in call order
+    """
+    from app.services import chat_agent
+
+    spans = {}
+
+    def fake_execute_tool(tool_name, tool_args, user_id, context=None):
+        key = f"{tool_name}:{tool_args.get('task_id', tool_args.get('title'))}"
+        start = time.perf_counter()
+        time.sleep(0.2)
+        spans.setdefault(key, []).append((start, time.perf_counter()))
+        return {"ok": True, "message": key, "data": None}
+
+    monkeypatch.setattr(chat_agent, "execute_tool", fake_execute_tool)
+
+    calls = [
+        ("update_task", {"task_id": 7, "title": "x"}),
+        ("list_tasks", {"status": "all"}),
+        ("delete_task", {"task_id": 7, "confirm": True}),
+        ("complete_task", {"task_id": 8}),
+    ]
+
+    start = time.perf_counter()
+    results = asyncio.run(chat_agent.execute_tool_calls(calls, user_id=1))
+    elapsed = time.perf_counter() - start
+
+    assert [r["message"] for r in results] == ["update_task:7", "list_tasks:None", "delete_task:7", "complete_task:8"]
+
+    # task 7: update finished before delete started
+    assert spans["update_task:7"][0][1] <= spans["delete_task:7"][0][0]
+    # 4 calls x 0.2s: two lanes overlap with the task-7 lane (~0.4s, not ~0.8s)
+    assert elapsed < 0.7
+
+
+def test_chat_history_window_is_last_n_in_order(fake_openai, monkeypatch):
+    """
+    History window Gate:
+    - Up to MAX_HISTORY_MESSAGES stored messages are sent as-is, oldest first
+    """
+    from app.services import chat_agent
+
+    monkeypatch.setattr(chat_agent, "MAX_HISTORY_MESSAGES", 4)
+    fake_openai.turns = [{"content": "reply 1"}, {"content": "reply 2"}, {"content": "reply 3"}]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        conversation_id = None
+        for i in range(1, 4):
+            body = {"message": f"message {i}"}
+            if conversation_id:
+                body["conversation_id"] = conversation_id
+            r = client.post(CHAT_BASE, json=body, headers=headers)
+            assert r.status_code == 200, r.text
+            conversation_id = r.json()["conversation_id"]
+
+    sent = fake_openai.requests[-1]["messages"]
+    assert sent[0]["role"] == "system"
+    # history window = the 4 earlier messages (the current one is sent last, not twice)
+    assert [m["content"] for m in sent[1:-2]] == ["message 1", "reply 1", "message 2", "reply 2"]
+    assert sent[-2]["content"].startswith("Intent hint")
+    assert sent[-1] == {"role": "user", "content": "message 3"}
+
+
+def test_chat_history_past_row_cap_is_folded(fake_openai, monkeypatch):
+    """
+    History window Gate:
+    - More than MAX_HISTORY_MESSAGES short messages (token budget not reached):
+      every message older than the window goes into the summary, none is skipped
+    - The kept window shrinks to HISTORY_KEEP_RATIO of the cap
+    """
+    from app.services import chat_agent, chat_context
+
+    monkeypatch.setattr(chat_agent, "MAX_HISTORY_MESSAGES", 4)
+    monkeypatch.setattr(chat_context, "HISTORY_KEEP_RATIO", 0.5)
+
+    fake_openai.turns = [
+        {"content": "reply 1"},
+        {"content": "reply 2"},
+        {"content": "reply 3"},
+        {"content": "Summary A"},  # turn 4: 6 stored messages > cap of 4
+        {"content": "reply 4"},
+        {"content": "reply 5"},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        conversation_id = None
+        for i in range(1, 6):
+            body = {"message": f"message {i}"}
+            if conversation_id:
+                body["conversation_id"] = conversation_id
+            r = client.post(CHAT_BASE, json=body, headers=headers)
+            assert r.status_code == 200, r.text
+            conversation_id = r.json()["conversation_id"]
+
+    assert len(fake_openai.requests) == 6
+
+    summary_input = fake_openai.requests[3]["messages"][1]["content"]
+    for folded in ["message 1", "reply 1", "message 2", "reply 2"]:
+        assert f": {folded}\n" in summary_input + "\n"
+    assert "message 3" not in summary_input
+
+    sent = fake_openai.requests[-1]["messages"]
+    assert sent[1]["role"] == "system" and "Summary A" in sent[1]["content"]
+    assert [m["content"] for m in sent[2:-2]] == ["message 3", "reply 3", "message 4", "reply 4"]
+
+
+def test_chat_history_backlog_is_folded_in_bounded_chunks(fake_openai, monkeypatch):
+    """
+    History window Gate:
+    - A backlog longer than MAX_HISTORY_MESSAGES with no summary yet is folded
+      oldest first, at most MAX_HISTORY_MESSAGES per turn (bounded prompt)
+    """
+    from app.services import chat_agent, chat_context
+
+    monkeypatch.setattr(chat_context, "HISTORY_KEEP_RATIO", 0.5)
+    fake_openai.turns = [{"content": f"reply {i}"} for i in range(1, 6)] + [
+        {"content": "Summary A"},
+        {"content": "reply 6"},
+        {"content": "Summary B"},
+        {"content": "reply 7"},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        conversation_id = None
+        for i in range(1, 8):
+            if i == 6:  # 10 stored messages, cap drops to 2
+                monkeypatch.setattr(chat_agent, "MAX_HISTORY_MESSAGES", 2)
+            body = {"message": f"message {i}"}
+            if conversation_id:
+                body["conversation_id"] = conversation_id
+            r = client.post(CHAT_BASE, json=body, headers=headers)
+            assert r.status_code == 200, r.text
+            conversation_id = r.json()["conversation_id"]
+
+    assert len(fake_openai.requests) == 9
+
+    first_fold = fake_openai.requests[5]["messages"][1]["content"] + "\n"
+    assert ": message 1\n" in first_fold and ": reply 1\n" in first_fold
+    assert "message 2" not in first_fold
+
+    second_fold = fake_openai.requests[7]["messages"][1]["content"] + "\n"
+    assert "Summary A" in second_fold
+    assert ": message 2\n" in second_fold and ": reply 2\n" in second_fold
+    assert "message 1" not in second_fold and "message 3" not in second_fold
+
+
+def test_chat_history_folds_into_rolling_summary(fake_openai, monkeypatch):
+    """
+    Context budget Gate:
+    - Overflowing the token budget folds the oldest turns into a summary (one LLM call)
+    - The summary is persisted and sent ahead of the kept turns
+    - Next turn reuses it (no re-summarization while the window fits)
+    """
+    from app.services import chat_context
+
+    monkeypatch.setattr(chat_context, "_encoding", None)  # deterministic local estimator
+    monkeypatch.setattr(chat_context, "_encoding_loaded", True)
+    monkeypatch.setattr(chat_context, "HISTORY_TOKEN_BUDGET", 40)
+    monkeypatch.setattr(chat_context, "HISTORY_KEEP_RATIO", 0.5)
+
+    fake_openai.turns = [
+        {"content": "reply 1"},
+        {"content": "reply 2"},
+        {"content": "reply 3"},
+        {"content": "reply 4"},
+        {"content": "Summary A"},  # turn 5: fold
+        {"content": "reply 5"},
+        {"content": "reply 6"},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        conversation_id = None
+        for i in range(1, 7):
+            body = {"message": f"message {i}"}
+            if conversation_id:
+                body["conversation_id"] = conversation_id
+            r = client.post(CHAT_BASE, json=body, headers=headers)
+            assert r.status_code == 200, r.text
+            conversation_id = r.json()["conversation_id"]
+
+        # Full history is untouched by summarization
+        history = client.get(f"{CHAT_BASE}/history/{conversation_id}", headers=headers).json()
+        assert len(history["messages"]) == 12
+
+    assert len(fake_openai.requests) == 7
+
+    summary_request = fake_openai.requests[4]["messages"]
+    assert summary_request[0]["content"] == chat_context.SUMMARY_PROMPT
+    assert "message 3" in summary_request[1]["content"]
+    assert "reply 3" not in summary_request[1]["content"]
+
+    sent = fake_openai.requests[-1]["messages"]
+    assert sent[1]["role"] == "system" and "Summary A" in sent[1]["content"]
+    assert [m["content"] for m in sent[2:-2]] == ["reply 3", "message 4", "reply 4", "message 5", "reply 5"]
+
+
+def test_prompt_prefix_is_stable_across_requests(fake_openai):
+    """
+    Prompt cache Gate:
+    - Tools + system prompt are byte-identical across requests with different intents
+    - History follows the system prompt; the per-request intent hint comes after it
+    - Provider usage (incl. cached prompt tokens) is counted in /metrics
+    """
+    fake_openai.turns = [{"content": "added"}, {"content": "here they are"}]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        before = client.get("/api/metrics").json()["llm_prompt"]
+
+        r = client.post(CHAT_BASE, json={"message": "add buy milk"}, headers=headers)
+        assert r.status_code == 200, r.text
+        r = client.post(
+            CHAT_BASE,
+            json={"message": "show my tasks", "conversation_id": r.json()["conversation_id"]},
+            headers=headers,
+        )
+        assert r.status_code == 200, r.text
+
+        after = client.get("/api/metrics").json()["llm_prompt"]
+
+    first, second = fake_openai.requests
+    assert json.dumps(first["tools"]) == json.dumps(second["tools"])
+    assert first["messages"][0] == second["messages"][0]
+    assert "Intent hint" not in second["messages"][0]["content"]
+
+    assert [m["content"] for m in second["messages"][1:3]] == ["add buy milk", "added"]
+    assert second["messages"][-2] == {"role": "system", "content": "Intent hint (optional): list"}
+
+    assert after["calls"] - before["calls"] == 2
+    assert after["cached_tokens"] - before["cached_tokens"] == 128
+
+
+def test_fast_path_skips_llm_for_simple_commands(fake_openai, monkeypatch):
+    """
+    Fast path Gate (CHAT_FAST_PATH):
+    - Plain add/list commands run their tool directly (no OpenAI call)
+    - Replies are templated in the resolved language (en/ur)
+    - Destructive commands still go to the LLM
+    - Hits and latency are reported in /metrics
+    """
+    from app.services import chat_agent
+
+    monkeypatch.setattr(chat_agent, "CHAT_FAST_PATH", True)
+    fake_openai.turns = [{"content": "Which task do you want to delete?"}]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        before = client.get("/api/metrics").json()["chat_fast_path"]
+
+        r = client.post(CHAT_BASE, json={"message": "add fast path milk"}, headers=headers)
+        assert r.status_code == 200, r.text
+        data = r.json()
+        task_id = data["tool_calls"][0]["result"]["data"]["id"]
+        assert data["response"] == f'Added "fast path milk" to your tasks (#{task_id}).'
+        assert data["tool_calls"][0]["tool"] == "add_task"
+
+        r = client.post(
+            CHAT_BASE,
+            json={"message": "میرے کام دکھاؤ", "conversation_id": data["conversation_id"]},
+            headers=headers,
+        )
+        assert r.status_code == 200, r.text
+        reply = r.json()["response"]
+        assert reply.startswith("آپ کے کام:")
+        assert f"[ ] #{task_id} fast path milk" in reply
+
+        r = client.post(f"{CHAT_BASE}/stream", json={"message": "show my pending tasks"}, headers=headers)
+        names = [name for name, _ in _parse_sse(r.text)]
+        assert names == ["conversation", "tool_call", "tool_result", "token", "done"]
+
+        assert len(fake_openai.requests) == 0
+
+        r = client.post(CHAT_BASE, json={"message": f"delete task {task_id}"}, headers=headers)
+        assert r.json()["response"] == "Which task do you want to delete?"
+        assert len(fake_openai.requests) == 1
+
+        after = client.get("/api/metrics").json()["chat_fast_path"]
+
+    assert after["enabled"] is True
+    assert after["hits"] - before["hits"] == 3
+    assert after["agent_runs"] - before["agent_runs"] == 1
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("add salt and pepper", ("add_task", {"title": "salt and pepper"})),
+        ("create task: call mom", ("add_task", {"title": "call mom"})),
+        ("add eggs and add bread", None),
+        ("add milk then show my tasks", None),
+        ("add milk and list my tasks", None),
+        ("add eggs; buy bread", None),
+        ("add milk and delete task 3", None),
+        ("کام شامل کرو: دودھ لانا پھر کام دکھاؤ", None),
+    ],
+)
+def test_fast_path_leaves_compound_commands_to_llm(message, expected):
+    """
+    Fast path Gate: compound requests are not stored as one task.
+    """
+    from app.services.skills.fast_path_skill import match_command
+
+    assert match_command(message) == expected
+
+
+def test_read_only_turns_are_cached_until_tasks_change(fake_openai):
+    """
+    Response cache Gate:
+    - A list turn answered with read-only tools is served from cache next time
+      (equivalent phrasing shares the entry; no OpenAI call)
+    - Any task mutation (REST or MCP tool) bumps the task version: no stale answer
+    - Hit/miss counters are exposed in /metrics
+    """
+    from app.services import chat_cache
+
+    chat_cache.response_cache.clear()
+    fake_openai.turns = [
+        {"tool_calls": [("list_tasks", {"status": "pending"})]},
+        {"content": "You have 1 pending task."},
+        {"tool_calls": [("list_tasks", {"status": "pending"})]},
+        {"content": "You have 2 pending tasks."},
+        {"tool_calls": [("list_tasks", {"status": "pending"})]},
+        {"content": "You have 1 pending task again."},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        before = client.get("/api/metrics").json()["chat_response_cache"]
+
+        first = client.post(CHAT_BASE, json={"message": "show my pending tasks"}, headers=headers).json()
+        assert first["response"] == "You have 1 pending task."
+        assert len(fake_openai.requests) == 2
+
+        again = client.post(CHAT_BASE, json={"message": "List pending tasks!"}, headers=headers).json()
+        assert again["response"] == "You have 1 pending task."
+        assert again["tool_calls"] == first["tool_calls"]
+        assert len(fake_openai.requests) == 2
+
+        r = client.post("/api/tasks", json={"title": "Cache buster"}, headers=headers)
+        assert r.status_code == 201, r.text
+
+        fresh = client.post(CHAT_BASE, json={"message": "show my pending tasks"}, headers=headers).json()
+        assert fresh["response"] == "You have 2 pending tasks."
+        assert len(fake_openai.requests) == 4
+
+        # Core-level DELETE path bumps too
+        r = client.delete(f"/api/tasks/{r.json()['id']}", headers=headers)
+        assert r.status_code == 204
+
+        fresh = client.post(CHAT_BASE, json={"message": "show my pending tasks"}, headers=headers).json()
+        assert fresh["response"] == "You have 1 pending task again."
+        assert len(fake_openai.requests) == 6
+
+        after = client.get("/api/metrics").json()["chat_response_cache"]
+
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 3
+
+
+def test_task_change_in_another_process_invalidates_cache(fake_openai):
+    """
+    Response cache Gate (multi-worker):
+    - A task added by another process (MCP tool in a separate worker) bumps
+      the shared task version: this process does not serve its cached answer
+    """
+    from sqlmodel import Session, select
+
+    from app.database import engine
+    from app.models import User
+    from app.services import chat_cache
+
+    with Session(engine) as session:
+        user_id = session.exec(select(User.id).where(User.email == os.getenv("TEST_USER_EMAIL"))).one()
+
+    chat_cache.response_cache.clear()
+    fake_openai.turns = [
+        {"tool_calls": [("list_tasks", {"status": "all"})]},
+        {"content": "Before the other worker."},
+        {"tool_calls": [("list_tasks", {"status": "all"})]},
+        {"content": "After the other worker."},
+    ]
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        first = client.post(CHAT_BASE, json={"message": "show my tasks"}, headers=headers).json()
+        assert first["response"] == "Before the other worker."
+
+        cached = client.post(CHAT_BASE, json={"message": "show my tasks"}, headers=headers).json()
+        assert cached["response"] == "Before the other worker."
+        assert len(fake_openai.requests) == 2
+
+        worker = (
+            "from app.main import app\n"
+            "from app.mcp_tools.schemas import AddTaskInput\n"
+            "from app.mcp_tools.tools import add_task_tool\n"
+            f"assert add_task_tool(AddTaskInput(user_id='{user_id}', title='Other worker task')).ok\n"
+        )
+        done = subprocess.run([sys.executable, "-c", worker], cwd=API_DIR, env=os.environ.copy(), timeout=60)
+        assert done.returncode == 0
+
+        fresh = client.post(CHAT_BASE, json={"message": "show my tasks"}, headers=headers).json()
+        assert fresh["response"] == "After the other worker."
+        assert len(fake_openai.requests) == 4
+
+        other = next(t for t in client.get("/api/tasks", headers=headers).json() if t["title"] == "Other worker task")
+        assert client.delete(f"/api/tasks/{other['id']}", headers=headers).status_code == 204
+
+
+def test_task_version_is_read_on_the_only_checked_out_connection(fake_openai, monkeypatch):
+    """
+    Response cache Gate (pool):
+    - A follow-up list turn reads the task version while the request session
+      holds no connection (blocking and streaming): one checkout, not two
+    """
+    from app.database import async_engine
+    from app.services import chat_cache
+
+    chat_cache.response_cache.clear()
+    fake_openai.turns = [
+        {"content": "first"},
+        {"tool_calls": [("list_tasks", {"status": "all"})]},
+        {"content": "Blocking list."},
+        {"content": "second"},
+        {"tool_calls": [("list_tasks", {"status": "all"})]},
+        {"content": "Streamed list."},
+    ]
+    checked_out = []
+    task_version = chat_cache.task_version
+
+    async def recording_task_version(connection, user_id):
+        checked_out.append(async_engine.pool.checkedout())
+        return await task_version(connection, user_id)
+
+    monkeypatch.setattr(chat_cache, "task_version", recording_task_version)
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+
+        conversation_id = client.post(CHAT_BASE, json={"message": "hello"}, headers=headers).json()["conversation_id"]
+        r = client.post(CHAT_BASE, json={"message": "show my tasks", "conversation_id": conversation_id}, headers=headers)
+        assert r.json()["response"] == "Blocking list."
+
+        chat_cache.response_cache.clear()
+        conversation_id = client.post(CHAT_BASE, json={"message": "hi again"}, headers=headers).json()["conversation_id"]
+        r = client.post(
+            f"{CHAT_BASE}/stream",
+            json={"message": "show my tasks", "conversation_id": conversation_id},
+            headers=headers,
+        )
+        assert _parse_sse(r.text)[-1][1]["response"] == "Streamed list."
+
+    assert checked_out == [1, 1]
+
+
+@pytest.mark.parametrize("shared_session, expected_checkouts", [(False, 2), (True, 1)])
+def test_tool_calls_connection_per_lane_or_per_turn(fake_openai, monkeypatch, shared_session, expected_checkouts):
+    """
+    Shared tool session Gate:
+    - Default: tool calls of one lane (mutations of one task) share one pooled
+      connection; independent lanes get one each and run concurrently
+    - TOOL_SHARED_SESSION: the whole turn runs on one connection
+    - The JWT user is passed as context: no per-call User lookup
+    """
+    from sqlalchemy import event
+
+    from app.database import engine
+    from app.services import chat_agent
+
+    monkeypatch.setattr(chat_agent, "TOOL_SHARED_SESSION", shared_session)
+
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with TestClient(app) as client:
+        headers = _login_headers(client)
+        task_id = client.post("/api/tasks", json={"title": "Lane task"}, headers=headers).json()["id"]
+
+        fake_openai.turns = [
+            {"tool_calls": [
+                ("add_task", {"title": "Lane other"}),
+                ("complete_task", {"task_id": task_id}),
+                ("update_task", {"task_id": task_id, "title": "Lane task renamed"}),
+            ]},
+            {"content": "Done."},
+        ]
+
+        checkouts_before = engine.pool.metrics.checkouts
+        event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            r = client.post(CHAT_BASE, json={"message": "finish and rename the lane task"}, headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+        checkouts = engine.pool.metrics.checkouts - checkouts_before
+
+        assert r.status_code == 200, r.text
+        results = [call["result"] for call in r.json()["tool_calls"]]
+        assert all(result["ok"] for result in results)
+
+        tasks = {t["id"]: t for t in client.get("/api/tasks", headers=headers).json()}
+        for tid in (task_id, results[0]["data"]["id"]):
+            assert client.delete(f"/api/tasks/{tid}", headers=headers).status_code == 204
+
+    assert tasks[task_id]["is_completed"] is True
+    assert tasks[task_id]["title"] == "Lane task renamed"
+
+    # lanes: add_task | complete_task + update_task (same task)
+    assert checkouts == expected_checkouts
+    assert not [s for s in statements if 'FROM "user"' in s or "FROM user" in s]
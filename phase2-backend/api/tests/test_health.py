@@ -18,3 +18,24 @@ def test_health_ok():
 
     data = r.json()
     assert data == {"ok": True}
+
+
+def test_metrics_expose_db_pool():
+    """
+    Metrics Gate:
+    - Endpoint: GET /api/metrics
+    - Contract: db_pool has settings + per-engine pool state and checkout counters
+    """
+    with TestClient(app) as client:
+        assert client.get("/api/health").status_code == 200
+        r = client.get("/api/metrics")
+
+    assert r.status_code == 200
+
+    pool = r.json()["db_pool"]
+    assert pool["settings"]["pool_size"] > 0
+    for name in ("sync", "async"):
+        stats = pool[name]
+        for key in ("size", "in_use", "overflow", "checkouts", "wait_ms_avg", "wait_ms_max", "overflow_events", "timeouts"):
+            assert key in stats, f"{name} pool missing {key}"
+    assert pool["sync"]["checkouts"] >= 1
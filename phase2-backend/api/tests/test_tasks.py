@@ -87,16 +87,155 @@ def test_tasks_crud_flow():
 
         toggled = _toggle_task(client, headers, task_id)
         assert toggled.get("id") == task_id
+        assert toggled.get("is_completed") is True
+        assert toggled.get("title") == "Updated"
+
+        toggled_back = _toggle_task(client, headers, task_id)
+        assert toggled_back.get("is_completed") is False
 
         _delete_task(client, headers, task_id)
 
         items2 = _list_tasks(client, headers)
         assert all(t.get("id") != task_id for t in items2)
 
+        # Mutations on a missing task are privacy-preserving 404s
+        assert client.put(f"{TASKS_BASE}/{task_id}", json={"title": "x"}, headers=headers).status_code == 404
+        assert client.patch(f"{TASKS_BASE}/{task_id}/toggle", headers=headers).status_code == 404
+        assert client.delete(f"{TASKS_BASE}/{task_id}", headers=headers).status_code == 404
+
+
+def test_tasks_cursor_pagination():
+    """
+    Keyset Gate:
+    - Walk GET /api/tasks with limit=2 following X-Next-Cursor
+    - Every created task appears exactly once, newest first
+    - Offset paging still works alongside
+    """
+    with TestClient(app) as client:
+        token = _login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        created_ids = [_post_task(client, headers, f"Page Task {i}")["id"] for i in range(5)]
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            r = client.get(TASKS_BASE, params=params, headers=headers)
+            assert r.status_code == 200, f"List failed: {r.status_code} {r.text}"
+            seen.extend(t["id"] for t in r.json())
+            cursor = r.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen))
+        assert all(tid in seen for tid in created_ids)
+        # newest first: later-created tasks come earlier
+        positions = [seen.index(tid) for tid in created_ids]
+        assert positions == sorted(positions, reverse=True)
+
+        r = client.get(TASKS_BASE, params={"offset": 1, "limit": 2}, headers=headers)
+        assert r.status_code == 200
+        assert [t["id"] for t in r.json()] == seen[1:3]
+
+        r = client.get(TASKS_BASE, params={"cursor": "not-a-cursor"}, headers=headers)
+        assert r.status_code == 400
+
+        for tid in created_ids:
+            _delete_task(client, headers, tid)
+
+
+def test_task_mutations_without_returning(monkeypatch):
+    """
+    Fallback Gate: dialects without UPDATE ... RETURNING
+    use UPDATE + SELECT in one transaction with the same results.
+    """
+    from app.database import async_engine
+
+    monkeypatch.setattr(async_engine.dialect, "update_returning", False)
+
+    with TestClient(app) as client:
+        token = _login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        task_id = _post_task(client, headers, "No Returning")["id"]
+
+        updated = _put_task(client, headers, task_id, "Still Works")
+        assert updated.get("title") == "Still Works"
+
+        toggled = _toggle_task(client, headers, task_id)
+        assert toggled.get("is_completed") is True
+
+        assert client.put(f"{TASKS_BASE}/999999", json={"title": "x"}, headers=headers).status_code == 404
+
+        _delete_task(client, headers, task_id)
+
+
+def test_tasks_bulk_operations():
+    """
+    Bulk Gate:
+    - One POST /api/tasks/bulk applies create/update/toggle/delete in one transaction
+    - Per-item results keep request order; invalid items fail alone (400/404)
+    - Batches over the size limit are rejected
+    """
+    with TestClient(app) as client:
+        token = _login(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        keep = _post_task(client, headers, "Bulk keep")
+        flip = _post_task(client, headers, "Bulk flip")
+        drop = _post_task(client, headers, "Bulk drop")
+
+        operations = [
+            {"op": "create", "title": "  Bulk new A  "},
+            {"op": "create", "title": "Bulk new B"},
+            {"op": "create", "title": "   "},
+            {"op": "update", "id": keep["id"], "title": "Bulk kept"},
+            {"op": "update", "id": keep["id"], "title": "Bulk twice"},
+            {"op": "toggle", "id": flip["id"]},
+            {"op": "delete", "id": drop["id"]},
+            {"op": "toggle", "id": 999999},
+            {"op": "delete"},
+            {"op": "update", "id": flip["id"], "title": "x" * 81},
+        ]
+
+        r = client.post(f"{TASKS_BASE}/bulk", json={"operations": operations}, headers=headers)
+        assert r.status_code == 200, f"Bulk failed: {r.status_code} {r.text}"
+        results = r.json()["results"]
+        assert [item["index"] for item in results] == list(range(len(operations)))
+        assert [item["status"] for item in results] == [201, 201, 400, 200, 400, 200, 204, 404, 400, 400]
+
+        created_a, created_b = results[0]["task"], results[1]["task"]
+        assert created_a["title"] == "Bulk new A"
+        assert created_b["title"] == "Bulk new B"
+        assert results[2]["detail"] == "Title is required"
+        assert results[3]["task"]["title"] == "Bulk kept"
+        assert results[4]["detail"] == "Duplicate task id in batch"
+        assert results[5]["task"]["is_completed"] is True
+        assert results[7]["detail"] == "Task not found"
+        assert results[9]["detail"] == "Title too long (max 80)"
+
+        by_id = {t["id"]: t for t in _list_tasks(client, headers)}
+        assert created_a["id"] in by_id and created_b["id"] in by_id
+        assert by_id[keep["id"]]["title"] == "Bulk kept"
+        assert by_id[flip["id"]]["is_completed"] is True
+        assert by_id[flip["id"]]["title"] == "Bulk flip"
+        assert drop["id"] not in by_id
+
+        r = client.post(
+            f"{TASKS_BASE}/bulk",
+            json={"operations": [{"op": "create", "title": "t"}] * 501},
+            headers=headers,
+        )
+        assert r.status_code == 400
+
+        for tid in (keep["id"], flip["id"], created_a["id"], created_b["id"]):
+            _delete_task(client, headers, tid)
 
 
 ##run this in terminal
 ## cd "D:\Shoaib Project\nimbus-tasks\phase2-backend\api"
 ## .\.venv\Scripts\Activate.ps1
 ## python -m pytest -q tests\test_tasks.py
-